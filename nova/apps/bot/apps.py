@@ -23,6 +23,8 @@ class NovaConfig(AppConfig):
     client = None
     
     def ready(self) -> None:
+        from . import signals  # noqa: F401
+        
         if (
             (threading.current_thread() is not threading.main_thread()) or
             (NovaConfig.bot_thread is not None and NovaConfig.bot_thread.is_alive()) or
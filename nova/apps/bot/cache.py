@@ -0,0 +1,233 @@
+import os
+import time
+import threading
+
+from typing import Optional
+
+from .conf import conf
+from .log import Logger
+from .models import GuildConfig
+from .paths import Path
+from .pool import db_pool
+
+logger = Logger.DB
+
+
+# Entries are dropped by the receivers in `signals.py`, the TTL only covers writes that skip signals
+class GuildConfigCache:
+    def __init__(self, ttl: float) -> None:
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        
+        self._entries: dict[int, tuple[float, GuildConfig]] = {}
+        self._config_guilds: dict[int, int] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+    
+    async def get(self, guild_id: int) -> Optional[GuildConfig]:
+        entry = self._entries.get(guild_id)
+        
+        if entry and entry[0] > time.monotonic():
+            self.hits += 1
+            return entry[1]
+        
+        self.misses += 1
+        generation = self._generation
+        
+        config = await db_pool.guild_config(guild_id)
+        
+        if config is None:
+            return None
+        
+        with self._lock:
+            # Don't store a row that may have been invalidated while it was being fetched
+            if generation == self._generation:
+                self._entries[guild_id] = (time.monotonic() + self.ttl, config)
+                self._config_guilds[config.pk] = guild_id
+        
+        return config
+    
+    def invalidate(self, guild_id: int) -> None:
+        with self._lock:
+            self._generation += 1
+            entry = self._entries.pop(guild_id, None)
+            
+            if entry:
+                self._config_guilds.pop(entry[1].pk, None)
+        
+        logger.debug(f"Invalidated cached config for guild ({guild_id})")
+    
+    def invalidate_config(self, config_pk: int) -> None:
+        guild_id = self._config_guilds.get(config_pk)
+        
+        if guild_id is not None:
+            self.invalidate(guild_id)
+        else:
+            with self._lock:
+                self._generation += 1
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._config_guilds.clear()
+    
+    def stats(self) -> dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+
+# guild_id -> {user_id, ...}, kept current by the receivers in `signals.py`. `contains` returns
+# None until loaded so callers can fall back to the database
+class BlacklistIndex:
+    def __init__(self) -> None:
+        self.loaded = False
+        
+        self._index: dict[int, set[int]] = {}
+        self._changed = False
+        self._lock = threading.Lock()
+    
+    async def load(self, max_attempts: int = 3) -> None:
+        for _ in range(max_attempts):
+            self._changed = False
+            index: dict[int, set[int]] = {}
+            
+            rows = await db_pool.blacklist()
+            
+            for guild_id, user_id in rows:
+                index.setdefault(guild_id, set()).add(user_id)
+            
+            with self._lock:
+                # A blacklist edit landed mid-load, the snapshot may be missing it
+                if self._changed:
+                    continue
+                
+                self._index = index
+                self.loaded = True
+            
+            logger.info(f"Loaded blacklist index: [Guilds: {len(index)} | Entries: {self.size()}]")
+            return
+        
+        logger.warning("Blacklist kept changing while loading, falling back to the database")
+    
+    def contains(self, guild_id: int, user_id: int) -> Optional[bool]:
+        if not self.loaded:
+            return None
+        
+        users = self._index.get(guild_id)
+        return users is not None and user_id in users
+    
+    def add(self, guild_id: int, user_ids: set[int]) -> None:
+        with self._lock:
+            self._changed = True
+            self._index.setdefault(guild_id, set()).update(user_ids)
+    
+    def remove(self, guild_id: int, user_ids: set[int]) -> None:
+        with self._lock:
+            self._changed = True
+            users = self._index.get(guild_id)
+            
+            if users is not None:
+                users.difference_update(user_ids)
+                
+                if not users:
+                    del self._index[guild_id]
+    
+    def remove_guild(self, guild_id: int) -> None:
+        with self._lock:
+            self._changed = True
+            self._index.pop(guild_id, None)
+    
+    def remove_users(self, user_ids: set[int]) -> None:
+        with self._lock:
+            self._changed = True
+            
+            for guild_id in [g for g, users in self._index.items() if not users.isdisjoint(user_ids)]:
+                self._index[guild_id].difference_update(user_ids)
+                
+                if not self._index[guild_id]:
+                    del self._index[guild_id]
+    
+    def size(self) -> int:
+        return sum(len(users) for users in self._index.values())
+
+
+# Local writes update the set and bump a version file, other processes (e.g. the Django admin)
+# notice the bump with a throttled stat and reload
+class OwnerCache:
+    def __init__(self, version_path: str, check_interval: float = 2.0) -> None:
+        self.version_path = version_path
+        self.check_interval = check_interval
+        self.loaded = False
+        
+        self._owners: set[int] = set()
+        self._version: Optional[int] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+    
+    def _read_version(self) -> Optional[int]:
+        try:
+            return os.stat(self.version_path).st_mtime_ns
+        except OSError:
+            return None
+    
+    def bump(self) -> None:
+        try:
+            os.makedirs(os.path.dirname(self.version_path), exist_ok=True)
+            
+            with open(self.version_path, "w") as f:
+                f.write(str(time.time_ns()))
+        
+        except OSError as e:
+            logger.warning(f"Couldn't bump owner cache version, other processes may serve stale owners: {e}")
+            return
+        
+        # Our own bump doesn't need a reload, the set was already updated in place
+        self._version = self._read_version()
+    
+    async def load(self) -> None:
+        version = self._read_version()
+        owners = await db_pool.owners()
+        
+        with self._lock:
+            self._owners = owners
+            self._version = version
+            self._checked_at = time.monotonic()
+            self.loaded = True
+        
+        logger.debug(f"Loaded {len(owners)} owner(s)")
+    
+    async def contains(self, user_id: int) -> bool:
+        now = time.monotonic()
+        
+        if not self.loaded:
+            await self.load()
+        
+        elif now - self._checked_at >= self.check_interval:
+            self._checked_at = now
+            
+            if self._read_version() != self._version:
+                logger.info("Owners changed in another process, reloading")
+                await self.load()
+        
+        return user_id in self._owners
+    
+    def add(self, user_id: int) -> None:
+        with self._lock:
+            self._owners.add(user_id)
+    
+    def discard(self, user_id: int) -> None:
+        with self._lock:
+            self._owners.discard(user_id)
+    
+    def __len__(self) -> int:
+        return len(self._owners)
+
+
+guild_config_cache = GuildConfigCache(conf.database.config_cache_ttl)
+blacklist_index = BlacklistIndex()
+owner_cache = OwnerCache(Path.OWNERS_VERSION.value)
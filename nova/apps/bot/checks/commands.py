@@ -5,7 +5,8 @@ from typing import Callable, TypeVar
 from ..log import Logger
 from ..errors import UserBlacklisted, UserNotAdmin, UserNotOwner, UserNotInGuild
 from ..utils import get_member
-from ..models import Owners, Guilds
+from ..cache import blacklist_index, owner_cache
+from ..pool import db_pool
 
 logger = Logger.COMMAND_CHECKS
 
@@ -23,7 +24,7 @@ def is_guild() -> Callable[[T], T]:
 
 def is_owner() -> Callable[[T], T]:
     async def predicate(interaction: Interaction) -> bool:
-        if not await Owners.objects.filter(user_id=interaction.user.id).aexists():
+        if not await owner_cache.contains(interaction.user.id):
             raise UserNotOwner(interaction)
         
         return True
@@ -54,15 +55,27 @@ def not_blacklisted() -> Callable[[T], T]:
             logger.debug(f"Not blacklisted called in DM, skipping check")
             return True
         
-        guild = await Guilds.objects.filter(guild_id=interaction.guild.id).afirst()
+        blacklisted = blacklist_index.contains(interaction.guild.id, interaction.user.id)
         
-        if not guild:
+        if blacklisted is not None:
+            if blacklisted:
+                raise UserBlacklisted(interaction)
+            
+            return True
+        
+        blacklisted = await db_pool.is_blacklisted(interaction.guild.id, interaction.user.id)
+        
+        if blacklisted is None:
+            if not interaction.client.db_manager.is_ready:  # type: ignore
+                logger.debug(f"Guild '{interaction.guild.id}' hasn't been synced yet, skipping check")
+                return True
+            
             logger.warning(f"Couldn't fetch guild database entry for guild '{interaction.guild.id}'")
             logger.warning(f"User is probably in a guild that I'm not in, skipping check")
             
             return True
         
-        if await guild.blacklist.filter(user_id=interaction.user.id).aexists():
+        if blacklisted:
             raise UserBlacklisted(interaction)
         
         return True
@@ -1,13 +1,27 @@
-from typing import TYPE_CHECKING
+import time
+import asyncio
+import hashlib
+
+from asgiref.sync import sync_to_async
+from discord import Guild, Member
+from django.db import connection
+from django.db.models import Model
+from typing import TYPE_CHECKING, Iterable, Optional
 
 from ..utils import log_errors
-from ..log import Logger
+from ..managers.sync import SyncScheduler
+from ..managers.warns import resync_counters
+from ..log import Logger, log_exception
+from ..instrumentation import instrumentation
+from ..conf import conf
 
 from ..models import (
     Guilds,
     Users,
     UserConfig,
-    GuildConfig
+    GuildConfig,
+    Membership,
+    Warns
 )
 
 if TYPE_CHECKING:
@@ -15,105 +29,426 @@ if TYPE_CHECKING:
 
 logger = Logger.DB
 
+USER_FIELDS = ["user_name", "global_name", "avatar_url"]
+
+
+def is_member_admin(member: Member) -> bool:
+    return (
+        member.guild_permissions.administrator or
+        member.guild_permissions.manage_guild or
+        member.id == member.guild.owner_id
+    )
+
+
+def member_row(member: Member) -> tuple[str, str | None, str]:
+    return member.name, member.global_name, member.avatar.url if member.avatar else ""
+
+
+def membership_fingerprint(members: list[Member]) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    
+    for member in sorted(members, key=lambda m: m.id):
+        user_name, global_name, avatar_url = member_row(member)
+        digest.update(
+            f"{member.id}\x1f{user_name}\x1f{global_name or ''}\x1f{avatar_url}\x1f{int(is_member_admin(member))}\x1e"
+            .encode("utf-8")
+        )
+    
+    return digest.hexdigest()
+
+
+def chunks(items: list, size: int) -> Iterable[list]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
 
 class DBManager:
     def __init__(self, client: "Client") -> None:
         self.client = client
+        self.batch_size = conf.database.batch_size
+        self.scheduler = SyncScheduler(client, self)
+        self.ready = asyncio.Event()
+        
+        self._reconcile_task: Optional[asyncio.Task] = None
+    
+    @property
+    def is_ready(self) -> bool:
+        return self.ready.is_set()
+    
+    def start_reconciliation(self) -> asyncio.Task:
+        if self._reconcile_task and not self._reconcile_task.done():
+            logger.info("Reconciliation is already running, not starting another one")
+            return self._reconcile_task
+        
+        self._reconcile_task = asyncio.create_task(self._reconcile(), name="nova-db-reconcile")
+        
+        return self._reconcile_task
+    
+    async def _reconcile(self, retry_delay: float = 30.0, max_retry_delay: float = 600.0) -> None:
+        guilds: Optional[list[Guild]] = None
+        attempt = 0
+        
+        while True:
+            start = time.time()
+            pending = list(guilds if guilds is not None else self.client.guilds)
+            
+            try:
+                async with instrumentation.track("reconcile", "job"):
+                    failed = await self._populate(pending)
+                    
+                    # Every guild failing points at the database rather than at the guilds
+                    if failed and len(failed) == len(pending):
+                        raise RuntimeError(f"All {len(failed)} guild(s) failed to sync")
+                    
+                    # Don't purge against a partially synced database, wait for the retries
+                    if not failed:
+                        await self._purge()
+                        
+                        drifted = await resync_counters()
+                        
+                        if drifted:
+                            logger.info(f"Corrected {len(drifted)} drifted warn counter(s)")
+                            await self.client.warn_engine.check(drifted)
+            
+            except asyncio.CancelledError:
+                logger.warning("Reconciliation cancelled")
+                raise
+            
+            except Exception as e:
+                attempt += 1
+                delay = min(retry_delay * attempt, max_retry_delay)
+                
+                logger.error(f"Reconciliation failed (Attempt {attempt}), retrying in {delay:.0f}s")
+                log_exception(e, logger)
+                
+                await asyncio.sleep(delay)
+                continue
+            
+            if not self.is_ready:
+                self.ready.set()
+                logger.info("Database is ready")
+            
+            logger.info(f"Reconciliation took {time.time() - start:.2f}s")
+            
+            if not failed:
+                return
+            
+            attempt += 1
+            delay = min(retry_delay * attempt, max_retry_delay)
+            guilds = [guild for guild in failed if self.client.get_guild(guild.id)]
+            
+            logger.warning(
+                f"{len(failed)} guild(s) failed to sync, retrying them in {delay:.0f}s (purge skipped until then)"
+            )
+            
+            await asyncio.sleep(delay)
+    
+    async def stop(self) -> None:
+        if self._reconcile_task and not self._reconcile_task.done():
+            self._reconcile_task.cancel()
+            
+            try:
+                await self._reconcile_task
+            except asyncio.CancelledError:
+                pass
     
     @log_errors(logger)
     async def populate_database(self) -> None:
+        await self._populate()
+    
+    async def _populate(self, guilds: Optional[list[Guild]] = None) -> list[Guild]:
         logger.info("Populating database")
-
-        async for guild in self.client.fetch_guilds(limit=None):
-            full_guild = await self.client.fetch_guild(guild.id)
+        
+        return await self.scheduler.run(guilds)
+    
+    @log_errors(logger)
+    async def sync_guild(self, guild: Guild) -> bool:
+        if not guild.chunked:
+            await guild.chunk()
+        
+        members = [member for member in guild.members]
+        fingerprint = membership_fingerprint(members)
+        db_guild = await self._upsert_guild(guild)
+        
+        if db_guild.member_fingerprint == fingerprint:
+            logger.debug(f"No membership changes in '{guild.name}' ({guild.id}), skipping")
+            return True
+        
+        await self._upsert_users(members)
+        await self._link_members(db_guild, members)
+        
+        db_guild.member_fingerprint = fingerprint
+        await db_guild.asave(update_fields=["member_fingerprint"])
+        
+        return True
+    
+    @log_errors(logger)
+    async def sync_member(self, member: Member) -> None:
+        guild = member.guild
+        
+        await self._upsert_guild(guild)
+        await self._upsert_users([member])
+        
+        await self._upsert_memberships([
+            Membership(guild_id=guild.id, user_id=member.id, is_member=True, is_admin=is_member_admin(member))
+        ])
+        await self._clear_fingerprint(guild.id)
+        
+        logger.debug(f"Synced member {member.name} ({member.id}) of '{guild.name}' ({guild.id})")
+    
+    @log_errors(logger)
+    async def remove_member(self, member: Member) -> None:
+        guild = member.guild
+        
+        await Membership.objects.filter(guild_id=guild.id, user_id=member.id).aupdate(is_member=False, is_admin=False)
+        await self._clear_fingerprint(guild.id)
+        
+        logger.debug(f"Marked {member.name} ({member.id}) as departed from '{guild.name}' ({guild.id})")
+    
+    async def _clear_fingerprint(self, guild_id: int) -> None:
+        # The stored fingerprint no longer matches the members table, the next sync has to relink
+        await Guilds.objects.filter(guild_id=guild_id).aupdate(member_fingerprint="")
+    
+    async def _upsert_guild(self, guild: Guild) -> Guilds:
+        icon_url = guild.icon.url if guild.icon else ""
+        
+        try:
+            db_guild = await Guilds.objects.aget(guild_id=guild.id)
             
-            try:
-                db_guild = await Guilds.objects.aget(guild_id=guild.id)
-                
+            if db_guild.guild_name != guild.name or db_guild.guild_icon_url != icon_url:
                 db_guild.guild_name = guild.name
-                db_guild.guild_icon_url = guild.icon.url if guild.icon else ""
+                db_guild.guild_icon_url = icon_url
                 
-                await db_guild.asave()
+                await db_guild.asave(update_fields=["guild_name", "guild_icon_url"])
                 
                 logger.debug(f"Updated: {guild.name} ({guild.id})")
+        
+        except Guilds.DoesNotExist:
+            guild_config = await GuildConfig.objects.acreate()
+            db_guild = await Guilds.objects.acreate(
+                guild_id=guild.id,
+                guild_name=guild.name,
+                guild_icon_url=icon_url,
+                config=guild_config
+            )
             
-            except Guilds.DoesNotExist:
-                guild_config = await GuildConfig.objects.acreate()
-                db_guild = await Guilds.objects.acreate(
-                    guild_id=guild.id,
-                    guild_name=guild.name,
-                    guild_icon_url=guild.icon.url if guild.icon else "",
-                    config=guild_config
-                )
-                
-                logger.info(f"Added missing: {guild.name} ({guild.id})")
+            logger.info(f"Added missing: {guild.name} ({guild.id})")
+        
+        return db_guild
+    
+    async def _upsert_users(self, members: list[Member]) -> None:
+        # Guilds sync concurrently and share users, going through them in user_id order keeps
+        # overlapping updates from deadlocking on each other
+        by_id = {member.id: member for member in sorted(members, key=lambda member: member.id)}
+        existing: dict[int, Users] = {}
+        
+        for batch in chunks(list(by_id), self.batch_size):
+            async for user in Users.objects.filter(user_id__in=batch).only("user_id", *USER_FIELDS):
+                existing[user.user_id] = user
+        
+        changed = []
+        
+        for user_id, user in sorted(existing.items()):
+            row = member_row(by_id[user_id])
             
-            async for member in full_guild.fetch_members(limit=None):
-                full_member = await full_guild.fetch_member(member.id)
-                
-                try:
-                    db_member = await Users.objects.aget(user_id=member.id)
-                    
-                    db_member.user_name = member.name
-                    db_member.global_name = member.global_name
-                    db_member.avatar_url = member.avatar.url if member.avatar else ""
-                    
-                    await db_member.asave()
-                    
-                    logger.debug(f"Updated: {member.name} ({member.id})")
-                
-                except Users.DoesNotExist:
-                    user_config = await UserConfig.objects.acreate()
-                    db_member = await Users.objects.acreate(
-                        user_id=member.id,
-                        user_name=member.name,
-                        global_name=member.global_name,
-                        avatar_url=member.avatar.url if member.avatar else "",
-                        config=user_config
-                    )
-                    
-                    logger.info(f"Added missing: {member.name} ({member.id})")
-                
-                if not await db_guild.users.filter(user_id=db_member.user_id).aexists():
-                    await db_guild.users.aadd(db_member)
-
-                is_admin = (
-                    full_member.guild_permissions.administrator or
-                    full_member.guild_permissions.manage_guild or
-                    full_member.id == full_guild.owner_id
+            if (user.user_name, user.global_name, user.avatar_url) != row:
+                user.user_name, user.global_name, user.avatar_url = row
+                changed.append(user)
+        
+        if changed:
+            await Users.objects.abulk_update(changed, USER_FIELDS, batch_size=self.batch_size)
+            logger.debug(f"Updated {len(changed)} user(s)")
+        
+        missing = [member for user_id, member in by_id.items() if user_id not in existing]
+        
+        if not missing:
+            return
+        
+        configs = await UserConfig.objects.abulk_create(
+            [UserConfig() for _ in missing],
+            batch_size=self.batch_size
+        )
+        
+        rows = [(member.id, *member_row(member), config.pk) for member, config in zip(missing, configs)]
+        inserted: set[int] = set()
+        
+        for batch in chunks(rows, self.batch_size):
+            inserted |= await self._insert_users(batch)
+        
+        # Another guild inserted some of these users first, their configs were never linked
+        orphaned = [config_id for user_id, *_, config_id in rows if user_id not in inserted]
+        
+        if orphaned:
+            await UserConfig.objects.filter(pk__in=orphaned).adelete()
+        
+        logger.info(f"Added {len(inserted)} missing user(s)")
+    
+    @sync_to_async
+    def _insert_users(self, rows: list[tuple[int, str, Optional[str], str, int]]) -> set[int]:
+        qn = connection.ops.quote_name
+        columns = ", ".join(
+            qn(Users._meta.get_field(field).column)
+            for field in ("user_id", "user_name", "global_name", "avatar_url", "config")
+        )
+        
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {qn(Users._meta.db_table)} ({columns})
+                SELECT * FROM unnest(%s::bigint[], %s::varchar[], %s::varchar[], %s::varchar[], %s::bigint[])
+                ON CONFLICT (user_id) DO NOTHING
+                RETURNING user_id
+                """,
+                [list(column) for column in zip(*rows)]
+            )
+            
+            return {row[0] for row in cursor.fetchall()}
+    
+    async def _upsert_memberships(self, memberships: list[Membership]) -> None:
+        # Blacklist flags are owned by moderators, a sync only ever touches member/admin state
+        await Membership.objects.abulk_create(
+            memberships,
+            batch_size=self.batch_size,
+            update_conflicts=True,
+            unique_fields=["guild", "user"],
+            update_fields=["is_member", "is_admin"]
+        )
+    
+    async def _link_members(self, db_guild: Guilds, members: list[Member]) -> None:
+        guild_id = db_guild.guild_id
+        
+        # The whole membership state of the guild in one query
+        existing: dict[int, tuple[bool, bool]] = {
+            user_id: (is_member, is_admin) async for user_id, is_member, is_admin in
+            Membership.objects.filter(guild_id=guild_id).values_list("user_id", "is_member", "is_admin")
+        }
+        
+        changed = []
+        current = set()
+        
+        for member in members:
+            is_admin = is_member_admin(member)
+            current.add(member.id)
+            
+            if existing.get(member.id) == (True, is_admin):
+                continue
+            
+            if is_admin and not existing.get(member.id, (False, False))[1]:
+                logger.info(f"'{member.name}' ({member.id}) registered as an admin of " \
+                            f"'{db_guild.guild_name}' ({guild_id})")
+            
+            changed.append(Membership(guild_id=guild_id, user_id=member.id, is_member=True, is_admin=is_admin))
+        
+        # The member list is complete here (the guild was chunked), anyone missing has left
+        departed = [user_id for user_id, (is_member, _) in existing.items() if is_member and user_id not in current]
+        
+        if changed:
+            await self._upsert_memberships(changed)
+            logger.debug(f"Updated {len(changed)} membership(s) in '{db_guild.guild_name}' ({guild_id})")
+        
+        if departed:
+            await Membership.objects.filter(guild_id=guild_id, user_id__in=departed).aupdate(
+                is_member=False, is_admin=False
+            )
+            logger.debug(f"Marked {len(departed)} user(s) as departed from '{db_guild.guild_name}' ({guild_id})")
+    
+    @log_errors(logger)
+    async def purge_guild(self, guild_id: int) -> None:
+        # Only this guild's members can be orphaned by the purge, sweeping every user without a
+        # membership would also hit users a concurrent sync just created and hasn't linked yet
+        user_ids = [
+            user_id async for user_id in
+            Membership.objects.filter(guild_id=guild_id).values_list("user_id", flat=True)
+        ]
+        
+        # Warns only reach a guild through the M2M, so drop them before the links disappear
+        await Warns.objects.filter(guilds__guild_id=guild_id).adelete()
+        
+        # Deleting the config cascades to the guild row and its memberships
+        deleted, _ = await GuildConfig.objects.filter(guild__guild_id=guild_id).adelete()
+        
+        if deleted:
+            logger.info(f"Removed guild ({guild_id}) from the database")
+        
+        await self._purge_orphaned_users(user_ids)
+    
+    async def _purge_orphaned_users(self, user_ids: list[int]) -> int:
+        users = 0
+        
+        # Users are attached through their config, deleting it cascades to the user row
+        for batch in chunks(user_ids, self.batch_size):
+            _, by_model = await UserConfig.objects.filter(
+                user__user_id__in=batch
+            ).exclude(user__memberships__is_member=True).adelete()
+            
+            users += by_model.get(Users._meta.label, 0)
+        
+        if users:
+            logger.info(f"Removed {users} user(s) that no longer share a guild with me")
+        
+        return users
+    
+    @sync_to_async
+    def _missing_ids(self, model: type[Model], ids: list[int]) -> list[int]:
+        table = connection.ops.quote_name(model._meta.db_table)
+        column = connection.ops.quote_name(model._meta.pk.column)
+        
+        # A single array parameter instead of one placeholder per id, diffed by Postgres
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT {column} FROM {table} WHERE NOT ({column} = ANY(%s::bigint[]))", [ids])
+            return [row[0] for row in cursor.fetchall()]
+    
+    @sync_to_async
+    def _prune_admins(self, guild_ids: list[int], admin_pairs: list[tuple[int, int]]) -> list[tuple[int, int]]:
+        table = connection.ops.quote_name(Membership._meta.db_table)
+        
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                UPDATE {table} AS t SET is_admin = false
+                WHERE t.guild_id = ANY(%s::bigint[]) AND t.is_admin
+                AND NOT EXISTS (
+                    SELECT 1 FROM unnest(%s::bigint[], %s::bigint[]) AS a(guild_id, user_id)
+                    WHERE a.guild_id = t.guild_id AND a.user_id = t.user_id
                 )
-                
-                if is_admin:
-                    if not await db_guild.admins.filter(user_id=db_member.user_id).aexists():
-                        logger.info(f"'{db_member.user_name}' ({db_member.user_id}) registered as an admin of " \
-                                    f"'{guild.name}' ({guild.id})")
-                        await db_guild.admins.aadd(db_member)
+                RETURNING t.guild_id, t.user_id
+                """,
+                [guild_ids, [pair[0] for pair in admin_pairs], [pair[1] for pair in admin_pairs]]
+            )
+            return cursor.fetchall()
     
     @log_errors(logger)
     async def purge_database(self) -> None:
+        await self._purge()
+    
+    async def _purge(self) -> None:
         logger.info("Purging database")
         
         current_guild_ids = [g.id for g in self.client.guilds]
         current_user_ids = [u.id for u in self.client.users]
         
-        async for guild in Guilds.objects.all():
-            if guild.guild_id not in current_guild_ids:
-                logger.info(f"Guild '{guild.guild_name}' ({guild.guild_id}) no longer exists or bot is no longer in it")
-                await guild.adelete()
-            else:
-                bot_guild = await self.client.fetch_guild(guild.guild_id)
-                
-                async for db_admin in guild.admins.all():
-                    member = await bot_guild.fetch_member(db_admin.user_id)
-                    
-                    if not member or not (
-                        member.guild_permissions.administrator or member.guild_permissions.manage_guild
-                    ):
-                        logger.info(f"'{db_admin.user_name}' ({db_admin.user_id}) unregistered as an admin of \
-                                      '{guild.guild_name}' ({guild.guild_id})")
-                        await guild.admins.aremove(db_admin)
-        
-        async for user in Users.objects.all():
-            if user.user_id not in current_user_ids:
-                logger.info(f"User '{user.user_name}' ({user.user_id}) is no longer visible to the bot")
-                await user.adelete()
\ No newline at end of file
+        stale_guilds = await self._missing_ids(Guilds, current_guild_ids)
+        
+        if stale_guilds:
+            await Warns.objects.filter(guilds__guild_id__in=stale_guilds).adelete()
+            await GuildConfig.objects.filter(guild__guild_id__in=stale_guilds).adelete()
+            
+            logger.info(f"Removed {len(stale_guilds)} guild(s) that no longer exist or I'm no longer in")
+        
+        # Only trust the member cache of fully chunked guilds, anything else is left as is
+        chunked = [g for g in self.client.guilds if g.chunked]
+        admin_pairs = [(g.id, m.id) for g in chunked for m in g.members if is_member_admin(m)]
+        
+        removed_admins = await self._prune_admins([g.id for g in chunked], admin_pairs)
+        
+        for guild_id, user_id in removed_admins:
+            logger.info(f"'{user_id}' unregistered as an admin of guild ({guild_id})")
+        
+        stale_users = await self._missing_ids(Users, current_user_ids)
+        
+        if stale_users:
+            # Batched so no single cascade collects an unbounded number of rows
+            for batch in chunks(stale_users, self.batch_size):
+                await UserConfig.objects.filter(user__user_id__in=batch).adelete()
+            
+            logger.info(f"Removed {len(stale_users)} user(s) that are no longer visible to me")
\ No newline at end of file
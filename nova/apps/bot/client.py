@@ -8,11 +8,14 @@ from secrets import token_urlsafe
 
 from .conf import conf
 from .checks import db, startup
-from .log import Logger, log_exception, format_exception, BOLD, RESET
-from .managers import events, tasks, locale, extensions
+from .log import Logger, log_exception, format_exception, flush_logs, BOLD, RESET
+from .managers import events, tasks, locale, extensions, warns
 from .helpers import generate_intents
-from .tree import TreeSyncer, on_error
+from .tree import TreeSyncer, NovaCommandTree, on_error
+from .instrumentation import instrumentation, install_sql_hook, install_http_hook
 from .objects import TTSClient
+from .cache import blacklist_index, owner_cache
+from .pool import db_pool
 
 logger = Logger.CLIENT
 
@@ -22,7 +25,8 @@ class Client(Bot):
         super().__init__(
             command_prefix="-",
             intents=generate_intents(conf.intents),
-            help_command=None
+            help_command=None,
+            tree_cls=NovaCommandTree
         )
         
         self.user: User
@@ -31,14 +35,36 @@ class Client(Bot):
         self.music_clients: dict[int, object] = {}  # TODO: Add music client type
         self.task_handler = tasks.TaskManager(self)
         self.db_manager = db.DBManager(self)
+        self.warn_engine = warns.WarnLimitEngine(self)
+        self.warn_queue = warns.WarnQueue(self.warn_engine)
         self.tree_syncer = TreeSyncer(self)
         self.start_time: float | None = None
         
         self._owner_token = token_urlsafe(32)
+        
+        install_sql_hook()
+        install_http_hook(self.http)
+    
+    async def _run_event(self, coro, event_name: str, *args, **kwargs) -> None:
+        async with instrumentation.track(event_name, "event"):
+            await super()._run_event(coro, event_name, *args, **kwargs)
     
     async def setup_hook(self) -> None:
         await self.tree.set_translator(locale.Translator())
         await self.tree_syncer.sync()
+        await db_pool.start()
+        self.warn_engine.attach()
+        self.warn_queue.start()
+        
+        try:
+            await blacklist_index.load()
+        except Exception as e:
+            logger.error(f"Failed to load blacklist index, checks will query the database: {format_exception(e)}")
+        
+        try:
+            await owner_cache.load()
+        except Exception as e:
+            logger.error(f"Failed to load owners, retrying on the first owner check: {format_exception(e)}")
     
     async def init(self) -> None:
         logger.info("Booting up")
@@ -102,6 +128,12 @@ class Client(Bot):
         except Exception as e:
             logger.error(f"Failed to cancel tasks: {format_exception(e)}")
         
+        try:
+            await self.db_manager.stop()
+        except Exception as e:
+            logger.error(f"Failed to stop database reconciliation: {format_exception(e)}")
+        
+        # Close the gateway first so no event can queue a warn after the final flush
         try:
             await self.close()
         except CancelledError:
@@ -110,4 +142,15 @@ class Client(Bot):
             logger.error(f"Error during bot.close(): {format_exception(e)}")
             log_exception(e, logger)
         
-        logger.info("Bye!")
\ No newline at end of file
+        try:
+            await self.warn_queue.stop()
+        except Exception as e:
+            logger.error(f"Failed to flush queued warns: {format_exception(e)}")
+        
+        try:
+            await db_pool.close()
+        except Exception as e:
+            logger.error(f"Failed to close connection pool: {format_exception(e)}")
+        
+        logger.info("Bye!")
+        flush_logs()
\ No newline at end of file
@@ -1,7 +1,7 @@
 import os
 import yaml
 
-from typing import Optional
+from typing import Optional, Literal
 from pydantic import BaseModel, Field
 
 from .paths import Path
@@ -27,6 +27,43 @@ class _Lavalink(BaseModel):
     password: str
 
 
+class _Logging(BaseModel):
+    json_output: bool = Field(alias="json", default=False)
+    queue_size: int = 10000
+    overflow: Literal["block", "drop_debug", "drop"] = "drop_debug"
+    block_timeout: float = 5.0
+    traceback_window: float = 300
+    traceback_summary_interval: float = 600
+    rotate_max_mb: int = 20
+    rotate_max_hours: float = 24
+    compress_history: bool = True
+    history_max_files: int = 30
+    history_max_mb: int = 500
+
+
+class _Database(BaseModel):
+    batch_size: int = 500
+    sync_concurrency: int = 4
+    sync_rate: float = 1.0
+    sync_burst: int = 10
+    config_cache_ttl: float = 300
+    pool_min_size: int = 1
+    pool_max_size: int = 10
+    pool_command_timeout: float = 5.0
+    pool_statement_cache_size: int = 100
+    pool_max_idle: float = 300
+    pool_health_check_interval: float = 30
+    warn_flush_ms: int = 500
+    warn_batch_size: int = 100
+
+
+class _Instrumentation(BaseModel):
+    enabled: bool = True
+    query_budget: int = 10
+    db_time_budget_ms: float = 250
+    rest_budget: int = 5
+
+
 class Config(BaseModel):
     version: str
     debug: bool
@@ -35,6 +72,9 @@ class Config(BaseModel):
     status: _Status
     spam_filter: _SpamFilter = Field(alias="spam-filter")
     lavalink: _Lavalink
+    logging: _Logging = Field(default_factory=_Logging)
+    database: _Database = Field(default_factory=_Database)
+    instrumentation: _Instrumentation = Field(default_factory=_Instrumentation)
     testing_servers: Optional[list[int]] = Field(alias="testing-servers", default_factory=list)
     tasks: list[str]
     internal_extensions: list[str] = Field(alias="internal-extensions")
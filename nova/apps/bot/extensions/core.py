@@ -6,6 +6,7 @@ Commands:
     * /help - Shows a paginated help embed
     * /ping - Shows the bot's latency to Discord
     * /sync <global> - Sync Nova's command tree to the current guild or globally
+    * /debug <reset> - Shows SQL, DB time and REST usage per command/event/job
     * /owner me <token> - Adds the caster to the owner list using the token provided during Nova's initialization
     * /owner add <user> - Adds a user to the owner list
     * /owner remove <user> - Removes a user from the owner list
@@ -56,6 +57,9 @@ from ..checks import commands
 from ..objects import CommandOptions
 from ..paths import Path
 from ..models import Owners
+from ..cache import owner_cache, guild_config_cache, blacklist_index
+from ..instrumentation import instrumentation
+from ..pool import db_pool
 from ..ui.default_pagination import DefaultPagination
 from ..responder import respond
 from ..log import Logger
@@ -201,12 +205,77 @@ class Core(Cog, name="core"):
         await respond(interaction, Colour.green(), get_str(locale, "core_sync_success"))
         await self.client.tree.sync(guild=guild)
     
+    # /debug
+    @command(
+        name=locale_str("core_debug_name"),
+        description=locale_str("core_debug_desc")
+    )
+    @rename(reset=locale_str("core_debug_reset_name"))
+    @describe(reset=locale_str("core_debug_reset_desc"))
+    @choices(reset=CommandOptions.BASIC_CONFIRMATION)
+    @commands.is_owner()
+    async def _debug(self, interaction: Interaction, reset: Choice[int] | None = None) -> None:
+        locale = get_locale(interaction)
+        
+        lines = [
+            get_str(
+                locale, "core_debug_entry",
+                name=name,
+                kind=aggregate.kind,
+                calls=aggregate.calls,
+                queries=aggregate.queries / aggregate.calls,
+                max_queries=aggregate.max_queries,
+                db_time=aggregate.db_time * 1000 / aggregate.calls,
+                rest=aggregate.rest_calls / aggregate.calls,
+                over=aggregate.over_budget
+            )
+            for name, aggregate in instrumentation.top(15)
+        ]
+        
+        cache_stats = guild_config_cache.stats()
+        
+        embed = Embed(
+            title=get_str(locale, "core_debug_title"),
+            description="\n".join(lines) if lines else get_str(locale, "core_debug_empty"),
+            colour=Colour.gold()
+        )
+        
+        embed.add_field(
+            name=get_str(locale, "core_debug_caches"),
+            value=get_str(
+                locale, "core_debug_caches_value",
+                hits=cache_stats["hits"],
+                misses=cache_stats["misses"],
+                blacklist=blacklist_index.size(),
+                owners=len(owner_cache)
+            ),
+            inline=False
+        )
+        
+        embed.add_field(
+            name=get_str(locale, "core_debug_database"),
+            value=get_str(
+                locale, "core_debug_database_value",
+                pool=get_str(locale, "state_on" if db_pool.available else "state_off"),
+                pending=len(self.client.warn_queue),
+                written=self.client.warn_queue.written
+            ),
+            inline=False
+        )
+        
+        if reset and choice_to_bool(reset):
+            instrumentation.reset()
+            embed.set_footer(text=get_str(locale, "core_debug_reset_done"))
+        
+        await respond(interaction, message=embed, hidden=True)
+    
     async def _add_owner(self, user: User | Member) -> bool:
         new_owner = await Owners.objects.acreate(
             user_id=user.id,
             user_name=user.display_name
         )
         await new_owner.asave()
+        owner_cache.add(new_owner.user_id)
         
         return new_owner is not None
     
@@ -221,7 +290,7 @@ class Core(Cog, name="core"):
     async def _owner_me(self, interaction: Interaction, token: str) -> None:
         locale = get_locale(interaction)
         
-        if await Owners.objects.filter(user_id=interaction.user.id).aexists():
+        if await owner_cache.contains(interaction.user.id):
             return await self.respond_with_failure(
                 interaction, "core_owner_me_already_owner", hidden=True
             )
@@ -249,7 +318,7 @@ class Core(Cog, name="core"):
     async def _owner_add(self, interaction: Interaction, user: Member) -> None:
         locale = get_locale(interaction)
         
-        if await Owners.objects.filter(user_id=user.id).aexists():
+        if await owner_cache.contains(user.id):
             return await self.respond_with_failure(
                 interaction, "core_owner_add_already_owner", hidden=True
             )
@@ -272,12 +341,14 @@ class Core(Cog, name="core"):
     async def _owner_remove(self, interaction: Interaction, user: Member) -> None:
         locale = get_locale(interaction)
         
-        if not await Owners.objects.filter(user_id=user.id).aexists():
+        if not await owner_cache.contains(user.id):
             return await self.respond_with_failure(
                 interaction, "core_owner_remove_not_owner", hidden=True
             )
         
         await Owners.objects.filter(user_id=user.id).adelete()
+        owner_cache.discard(user.id)
+        
         await respond(interaction, Colour.green(), get_str(locale, "core_owner_remove_success"))
     
     # /extension list
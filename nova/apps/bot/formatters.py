@@ -0,0 +1,82 @@
+import json
+import logging
+
+from logging import Formatter, LogRecord
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+DATE_FORMAT = "%d-%m-%y %H:%M:%S"
+
+
+class LoggingFormatter(Formatter):
+    black = "\x1b[30m"
+    red = "\x1b[31m"
+    green = "\x1b[32m"
+    yellow = "\x1b[33m"
+    blue = "\x1b[34m"
+    gray = "\x1b[38m"
+    reset = "\x1b[0m"
+    bold = "\x1b[1m"
+    
+    COLOURS = {
+        logging.DEBUG: gray + bold,
+        logging.INFO: blue + bold,
+        logging.WARNING: yellow + bold,
+        logging.ERROR: red,
+        logging.CRITICAL: red + bold
+    }
+    
+    FORMAT = "(black){asctime}(reset) (levelcolor){levelname:<8}(reset) (green){name}(reset) {message}"
+    
+    def __init__(self) -> None:
+        super().__init__(datefmt=DATE_FORMAT)
+        
+        self._formatters = {
+            level: self._build(colour) for level, colour in self.COLOURS.items()
+        }
+        self._default = self._build("")
+    
+    def _build(self, log_color: str) -> Formatter:
+        format_str = self.FORMAT
+        format_str = format_str.replace("(black)", self.black + self.bold)
+        format_str = format_str.replace("(reset)", self.reset)
+        format_str = format_str.replace("(levelcolor)", log_color)
+        format_str = format_str.replace("(green)", self.green + self.bold)
+        
+        return Formatter(format_str, DATE_FORMAT, style="{")
+    
+    def format(self, record: LogRecord) -> str:
+        return self._formatters.get(record.levelno, self._default).format(record)
+
+
+def _dumps(data: dict) -> str:
+    if orjson is not None:
+        return orjson.dumps(data, default=str).decode("utf-8")
+    
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+# Context fields come from the record's `extra` (see `utils.get_log_context`), null when missing
+class JsonFormatter(Formatter):
+    FIELDS = ("guild_id", "user_id", "command", "latency_ms")
+    
+    def format(self, record: LogRecord) -> str:
+        data = {
+            "ts": round(record.created, 6),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage()
+        }
+        
+        for field in self.FIELDS:
+            data[field] = record.__dict__.get(field)
+        
+        if record.exc_info:
+            data["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            data["exc"] = record.exc_text
+        
+        return _dumps(data)
\ No newline at end of file
@@ -0,0 +1,162 @@
+import time
+
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from django.db.backends.signals import connection_created
+from typing import Optional, AsyncIterator
+
+from .conf import conf
+from .log import Logger
+
+logger = Logger.METRICS
+
+
+@dataclass(slots=True)
+class Span:
+    name: str
+    kind: str
+    parent: Optional["Span"] = None
+    queries: int = 0
+    db_time: float = 0.0
+    rest_calls: int = 0
+    closed: bool = False
+
+
+@dataclass(slots=True)
+class Aggregate:
+    kind: str
+    calls: int = 0
+    queries: int = 0
+    db_time: float = 0.0
+    rest_calls: int = 0
+    wall_time: float = 0.0
+    max_queries: int = 0
+    over_budget: int = 0
+
+
+_current: ContextVar[Optional[Span]] = ContextVar("nova_span", default=None)
+
+
+# Commands, event listeners and jobs run inside a span, SQL (Django and the pool) and REST calls
+# are charged to the active one and finished spans are folded into per-name aggregates for /debug
+class Instrumentation:
+    def __init__(self) -> None:
+        self.enabled = conf.instrumentation.enabled
+        self.stats: dict[str, Aggregate] = {}
+    
+    @staticmethod
+    def current() -> Optional[Span]:
+        # Tasks spawned inside a span inherit it, but stop being charged once it finishes
+        span = _current.get()
+        return span if span and not span.closed else None
+    
+    def record_query(self, elapsed: float) -> None:
+        span = self.current()
+        
+        if span:
+            span.queries += 1
+            span.db_time += elapsed
+    
+    def record_rest(self) -> None:
+        span = self.current()
+        
+        if span:
+            span.rest_calls += 1
+    
+    @asynccontextmanager
+    async def track(self, name: str, kind: str) -> AsyncIterator[Optional[Span]]:
+        if not self.enabled:
+            yield None
+            return
+        
+        span = Span(name, kind, parent=self.current())
+        token = _current.set(span)
+        start = time.perf_counter()
+        
+        try:
+            yield span
+        
+        finally:
+            span.closed = True
+            _current.reset(token)
+            self._finish(span, time.perf_counter() - start)
+    
+    def _finish(self, span: Span, wall_time: float) -> None:
+        if span.parent and not span.parent.closed:
+            span.parent.queries += span.queries
+            span.parent.db_time += span.db_time
+            span.parent.rest_calls += span.rest_calls
+        
+        aggregate = self.stats.get(span.name)
+        
+        if aggregate is None:
+            aggregate = self.stats[span.name] = Aggregate(span.kind)
+        
+        aggregate.calls += 1
+        aggregate.queries += span.queries
+        aggregate.db_time += span.db_time
+        aggregate.rest_calls += span.rest_calls
+        aggregate.wall_time += wall_time
+        aggregate.max_queries = max(aggregate.max_queries, span.queries)
+        
+        summary = (
+            f"[Queries: {span.queries} | DB: {span.db_time * 1000:.2f}ms | "
+            f"REST: {span.rest_calls} | Took: {wall_time * 1000:.2f}ms]"
+        )
+        
+        # Jobs are expected to be heavy, they're reported but never held to a budget
+        if span.kind == "job":
+            logger.debug(f"Job '{span.name}' finished: {summary}")
+            return
+        
+        budget = conf.instrumentation
+        
+        if (
+            span.queries > budget.query_budget or
+            span.db_time * 1000 > budget.db_time_budget_ms or
+            span.rest_calls > budget.rest_budget
+        ):
+            aggregate.over_budget += 1
+            logger.warning(f"{span.kind.capitalize()} '{span.name}' went over budget: {summary}")
+    
+    def top(self, limit: int = 10) -> list[tuple[str, Aggregate]]:
+        return sorted(self.stats.items(), key=lambda item: item[1].db_time, reverse=True)[:limit]
+    
+    def reset(self) -> None:
+        self.stats.clear()
+
+
+instrumentation = Instrumentation()
+
+
+def _sql_wrapper(execute, sql, params, many, context):
+    start = time.perf_counter()
+    
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        instrumentation.record_query(time.perf_counter() - start)
+
+
+def _on_connection_created(sender, connection, **kwargs) -> None:
+    if _sql_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_sql_wrapper)
+
+
+def install_sql_hook() -> None:
+    connection_created.connect(_on_connection_created, dispatch_uid="nova_instrumentation_sql")
+
+
+def install_http_hook(http) -> None:
+    request = http.request
+    
+    if getattr(request, "__nova_instrumented__", False):
+        return
+    
+    async def instrumented_request(*args, **kwargs):
+        instrumentation.record_rest()
+        return await request(*args, **kwargs)
+    
+    instrumented_request.__nova_instrumented__ = True  # type: ignore
+    http.request = instrumented_request
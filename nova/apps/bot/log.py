@@ -1,91 +1,322 @@
 import os
+import copy
+import gzip
+import time
+import queue
+import atexit
 import shutil
+import hashlib
 import logging
+import threading
 import traceback
 
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional
 
 from logging import (
     Logger as LoggingLogger,
-    Formatter, FileHandler, StreamHandler,
+    LogRecord, Formatter, FileHandler, StreamHandler,
     INFO, ERROR, CRITICAL, DEBUG,
     getLogger
 )
 
+from logging.handlers import QueueHandler, QueueListener
+
 from .conf import conf
 from .paths import Path
+from .formatters import LoggingFormatter, JsonFormatter
 
 BOLD = "\x1b[1m"
 RESET = "\x1b[0m"
 
 
-class LoggingFormatter(Formatter):
-    black = "\x1b[30m"
-    red = "\x1b[31m"
-    green = "\x1b[32m"
-    yellow = "\x1b[33m"
-    blue = "\x1b[34m"
-    gray = "\x1b[38m"
-    reset = "\x1b[0m"
-    bold = "\x1b[1m"
-
-    COLOURS = {
-        logging.DEBUG: gray + bold,
-        logging.INFO: blue + bold,
-        logging.WARNING: yellow + bold,
-        logging.ERROR: red,
-        logging.CRITICAL: red + bold
-    }
-
-    def format(self, record):
-        log_color = self.COLOURS.get(record.levelno)
-
-        format_str = "(black){asctime}(reset) (levelcolor){levelname:<8}(reset) (green){name}(reset) {message}"
-        format_str = format_str.replace("(black)", self.black + self.bold)
-        format_str = format_str.replace("(reset)", self.reset)
-        format_str = format_str.replace("(levelcolor)", log_color if log_color is not None else "")
-        format_str = format_str.replace("(green)", self.green + self.bold)
-
-        formatter = logging.Formatter(format_str, "%d-%m-%y %H:%M:%S", style="{")
+# Compresses rotated logs and keeps at most `max_files` / `max_bytes` of history (0 disables a limit)
+class LogArchiver:
+    def __init__(self, directory: str, compress: bool, max_files: int, max_bytes: int) -> None:
+        self.directory = directory
+        self.compress = compress
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        
+        self._jobs: queue.Queue = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+    
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        
+        self._thread = threading.Thread(target=self._run, name="nova-log-archiver", daemon=True)
+        self._thread.start()
+        
+        # Pick up anything a previous run rotated but didn't get to compress
+        if self.compress and os.path.isdir(self.directory):
+            for file in os.listdir(self.directory):
+                if file.endswith(".log"):
+                    self.submit(os.path.join(self.directory, file))
+        
+        self._jobs.put(None)
+    
+    def archive(self, path: str, timestamp: float) -> Optional[str]:
+        os.makedirs(self.directory, exist_ok=True)
+        
+        name = f"nova-{datetime.fromtimestamp(timestamp).strftime('%d.%m.%y-%H%M%S')}"
+        target = os.path.join(self.directory, f"{name}.log")
+        suffix = 1
+        
+        while os.path.exists(target) or os.path.exists(f"{target}.gz"):
+            target = os.path.join(self.directory, f"{name}-{suffix}.log")
+            suffix += 1
+        
+        try:
+            shutil.move(path, target)
+        except FileNotFoundError:
+            return None
+        
+        self.submit(target)
+        
+        return target
+    
+    def submit(self, path: str) -> None:
+        self._jobs.put(path)
+    
+    def _compress(self, path: str) -> None:
+        if not self.compress or not os.path.exists(path):
+            return
+        
+        with open(path, "rb") as src, gzip.open(f"{path}.gz", "wb") as dst:
+            shutil.copyfileobj(src, dst, 1024 * 1024)
+        
+        # Keep the rotation time so retention still drops the oldest logs first
+        shutil.copystat(path, f"{path}.gz")
+        os.remove(path)
+    
+    def _enforce_retention(self) -> None:
+        if not os.path.isdir(self.directory):
+            return
+        
+        files = []
+        
+        for file in os.listdir(self.directory):
+            path = os.path.join(self.directory, file)
+            
+            if file.startswith("nova-") and os.path.isfile(path):
+                stat = os.stat(path)
+                files.append((stat.st_mtime, stat.st_size, path))
+        
+        files.sort(reverse=True)
+        total = 0
+        
+        for i, (_, size, path) in enumerate(files):
+            total += size
+            
+            if (self.max_files and i >= self.max_files) or (self.max_bytes and total > self.max_bytes):
+                os.remove(path)
+    
+    def _run(self) -> None:
+        while True:
+            path = self._jobs.get()
+            
+            try:
+                if path is not None:
+                    self._compress(path)
+                
+                if self._jobs.empty():
+                    self._enforce_retention()
+            
+            except Exception as e:
+                Logger.ROOT.error(f"Failed to archive log file '{path}': {format_exception(e)}")
+
+
+# Runs on the listener thread, compression is left to the archiver
+class RotatingLogHandler(FileHandler):
+    def __init__(self, filename: str, archiver: LogArchiver, max_bytes: int, max_age: float) -> None:
+        self.archiver = archiver
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        
+        super().__init__(filename=filename, mode="a", encoding="utf-8", delay=False)
+        
+        self.opened_at = time.time()
+    
+    def should_rollover(self) -> bool:
+        if self.max_age and time.time() - self.opened_at >= self.max_age:
+            return True
+        
+        if self.max_bytes and self.stream and self.stream.tell() >= self.max_bytes:
+            return True
+        
+        return False
+    
+    def do_rollover(self) -> None:
+        if self.stream:
+            self.stream.close()
+            self.stream = None  # type: ignore
+        
+        self.archiver.archive(self.baseFilename, self.opened_at)
+        
+        self.stream = self._open()
+        self.opened_at = time.time()
+    
+    def emit(self, record: LogRecord) -> None:
+        try:
+            if self.should_rollover():
+                self.do_rollover()
+        
+        except Exception:
+            self.handleError(record)
+        
+        super().emit(record)
 
-        return formatter.format(record)
 
 log_filename_latest = os.path.join(Path.LOG_LATEST)
 log_dirname_latest = os.path.dirname(log_filename_latest)
 
-if os.path.exists(log_filename_latest):
-    try:
-        creation_time = os.path.getctime(log_filename_latest)
-        old_timestamp = datetime.fromtimestamp(creation_time).strftime("%d.%m.%y-%H%M%S")
+log_archiver = LogArchiver(
+    Path.LOG_HISTORY,
+    conf.logging.compress_history,
+    conf.logging.history_max_files,
+    conf.logging.history_max_mb * 1024 * 1024
+)
 
-        os.makedirs(log_dirname_latest, exist_ok=True)
-        shutil.move(log_filename_latest, os.path.join(Path.LOG_HISTORY, f"nova-{old_timestamp}.log"))
+os.makedirs(log_dirname_latest, exist_ok=True)
 
-    except FileNotFoundError:
-        os.remove(log_filename_latest)
+if os.path.exists(log_filename_latest):
+    log_archiver.archive(log_filename_latest, os.path.getctime(log_filename_latest))
+
+log_archiver.start()
 
 console_handler = StreamHandler()
 console_handler.setFormatter(LoggingFormatter())
 
-file_handler = FileHandler(
+file_handler = RotatingLogHandler(
     filename=log_filename_latest,
-    mode="a",
-    encoding="utf-8",
-    delay=False
+    archiver=log_archiver,
+    max_bytes=conf.logging.rotate_max_mb * 1024 * 1024,
+    max_age=conf.logging.rotate_max_hours * 3600
 )
 
 file_handler.setFormatter(
-    Formatter(
+    JsonFormatter() if conf.logging.json_output else Formatter(
         "[{asctime}] [{levelname:<8}] {name}: {message}", "%d-%m-%y %H:%M:%S",
         style="{"
     )
 )
 
+
+# Overflow policy when the queue is full: `drop` drops everything, `drop_debug` drops DEBUG
+# records and blocks the rest, `block` blocks every record for up to `block_timeout` seconds
+class NovaQueueHandler(QueueHandler):
+    def __init__(self, log_queue: queue.Queue, overflow: str, block_timeout: float) -> None:
+        super().__init__(log_queue)
+        
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        self.dropped = 0
+        
+        self._exc_formatter = Formatter()
+    
+    def prepare(self, record: LogRecord) -> LogRecord:
+        # The base class folds the traceback into msg, keep it in exc_text so the JSON formatter
+        # can still emit it as its own field (text formatters append exc_text themselves)
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        
+        if record.exc_info:
+            record.exc_text = self._exc_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        
+        return record
+    
+    def enqueue(self, record: LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+            return
+        
+        except queue.Full:
+            pass
+        
+        if self.overflow == "drop" or (self.overflow == "drop_debug" and record.levelno <= DEBUG):
+            self.dropped += 1
+            return
+        
+        try:
+            self.queue.put(record, timeout=self.block_timeout)
+        except queue.Full:
+            self.dropped += 1
+
+
+class NovaQueueListener(QueueListener):
+    def __init__(self, log_queue: queue.Queue, *handlers, block_timeout: float, **kwargs) -> None:
+        super().__init__(log_queue, *handlers, **kwargs)
+        
+        self.block_timeout = block_timeout
+    
+    def enqueue_sentinel(self) -> None:
+        # The base class uses put_nowait, which raises queue.Full on a full queue during shutdown
+        while True:
+            try:
+                self.queue.put(self._sentinel, timeout=self.block_timeout)  # type: ignore
+                return
+            
+            except queue.Full:
+                if self._thread is None or not self._thread.is_alive():  # type: ignore
+                    return
+
+
+log_queue: queue.Queue = queue.Queue(maxsize=conf.logging.queue_size)
+
+queue_handler = NovaQueueHandler(log_queue, conf.logging.overflow, conf.logging.block_timeout)
+queue_listener = NovaQueueListener(
+    log_queue, console_handler, file_handler,
+    block_timeout=conf.logging.block_timeout,
+    respect_handler_level=True
+)
+queue_listener.start()
+
+
+def flush_logs() -> None:
+    traceback_aggregator.flush()
+    
+    if queue_listener._thread is None:
+        return
+    
+    queue_listener.stop()
+    
+    if queue_handler.dropped:
+        file_handler.handle(
+            logging.makeLogRecord({
+                "name": "RinBot",
+                "levelno": logging.WARNING,
+                "levelname": "WARNING",
+                "msg": f"Dropped {queue_handler.dropped} log record(s) because the log queue was full"
+            })
+        )
+        queue_handler.dropped = 0
+    
+    for handler in (console_handler, file_handler):
+        handler.flush()
+    
+    queue_listener.start()
+
+
+def stop_logging() -> None:
+    traceback_aggregator.flush()
+    
+    if queue_listener._thread is not None:
+        queue_listener.stop()
+    
+    for handler in (console_handler, file_handler):
+        handler.flush()
+
+
+atexit.register(stop_logging)
+
 root_logger = getLogger("RinBot")
 root_logger.setLevel(DEBUG if conf.debug else INFO)
-root_logger.addHandler(console_handler)
-root_logger.addHandler(file_handler)
+root_logger.addHandler(queue_handler)
 
 
 class Logger:
@@ -102,6 +333,7 @@ class Logger:
     HELPERS: LoggingLogger        = getLogger("Helpers")
     INTERFACE: LoggingLogger      = getLogger("Interface")
     LOCALE: LoggingLogger         = getLogger("Localisation")
+    METRICS: LoggingLogger        = getLogger("Metrics")
     MUSIC: LoggingLogger          = getLogger("Music")
     PROGRAMS: LoggingLogger       = getLogger("Programs")
     STARTUP_CHECKS: LoggingLogger = getLogger("Startup Checks")
@@ -123,8 +355,157 @@ for logger_name, custom_logger in vars(Logger).items():
     if isinstance(custom_logger, LoggingLogger) and logger_name != "root":
         custom_logger.setLevel(DEBUG if conf.debug else INFO)
         custom_logger.propagate = True
-        custom_logger.addHandler(console_handler)
-        custom_logger.addHandler(file_handler)
+        custom_logger.addHandler(queue_handler)
+
+
+@dataclass
+class _TracebackEntry:
+    exc_type: str
+    filename: str
+    window_start: float
+    first_seen: float
+    last_seen: float
+    count: int = 1
+    total: int = 1
+
+
+# One traceback file per distinct exception (type + frame stack) per window, repeats only bump
+# a counter that's flushed to `summary.txt` every `summary_interval` seconds
+class TracebackAggregator:
+    def __init__(self, directory: str, window: float, summary_interval: float) -> None:
+        self.directory = directory
+        self.window = window
+        self.summary_interval = summary_interval
+        
+        self._entries: dict[str, _TracebackEntry] = {}
+        self._lock = threading.Lock()
+        self._jobs: queue.Queue = queue.Queue()
+        self._dirty = False
+        self._thread: Optional[threading.Thread] = None
+    
+    @staticmethod
+    def fingerprint(e: BaseException) -> str:
+        digest = hashlib.blake2b(digest_size=8)
+        digest.update(f"{type(e).__module__}.{type(e).__qualname__}".encode())
+        
+        for frame in traceback.extract_tb(e.__traceback__):
+            digest.update(f"|{frame.filename}:{frame.lineno}:{frame.name}".encode())
+        
+        return digest.hexdigest()
+    
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        
+        self._thread = threading.Thread(target=self._run, name="nova-tracebacks", daemon=True)
+        self._thread.start()
+    
+    def record(self, e: BaseException) -> bool:
+        fingerprint = self.fingerprint(e)
+        now = time.time()
+        
+        with self._lock:
+            entry = self._entries.get(fingerprint)
+            self._dirty = True
+            
+            if entry and now - entry.window_start < self.window:
+                entry.count += 1
+                entry.total += 1
+                entry.last_seen = now
+                
+                return False
+            
+            timestamp = datetime.fromtimestamp(now).strftime("%d.%m.%y-%H%M%S")
+            filename = f"{type(e).__name__}-{timestamp}-{fingerprint}.txt"
+            
+            if entry:
+                entry.filename = filename
+                entry.window_start = now
+                entry.last_seen = now
+                entry.count = 1
+                entry.total += 1
+            else:
+                self._entries[fingerprint] = _TracebackEntry(
+                    exc_type=type(e).__name__,
+                    filename=filename,
+                    window_start=now,
+                    first_seen=now,
+                    last_seen=now
+                )
+        
+        self._jobs.put((filename, e))
+        
+        return True
+    
+    def _write_trace(self, filename: str, e: BaseException) -> None:
+        trace = "".join(traceback.format_exception(type(e), e, e.__traceback__))
+        
+        os.makedirs(self.directory, exist_ok=True)
+        
+        with open(os.path.join(self.directory, filename), "w", encoding="utf-8") as f:
+            f.write(trace)
+    
+    def _write_summary(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            
+            self._dirty = False
+            rows = sorted(self._entries.items(), key=lambda item: item[1].total, reverse=True)
+            rows = [
+                f"{fingerprint}  {entry.exc_type:<30} window: {entry.count:<6} total: {entry.total:<8} "
+                f"first: {datetime.fromtimestamp(entry.first_seen):%d.%m.%y-%H%M%S}  "
+                f"last: {datetime.fromtimestamp(entry.last_seen):%d.%m.%y-%H%M%S}  "
+                f"file: {entry.filename}"
+                for fingerprint, entry in rows
+            ]
+        
+        os.makedirs(self.directory, exist_ok=True)
+        
+        with open(os.path.join(self.directory, "summary.txt"), "w", encoding="utf-8") as f:
+            f.write(f"Traceback summary written at {datetime.now():%d.%m.%y-%H%M%S}\n\n")
+            f.write("\n".join(rows))
+    
+    def _run(self) -> None:
+        next_summary = time.monotonic() + self.summary_interval
+        
+        while True:
+            try:
+                if time.monotonic() >= next_summary:
+                    self._write_summary()
+                    next_summary = time.monotonic() + self.summary_interval
+                
+                try:
+                    job = self._jobs.get(timeout=max(next_summary - time.monotonic(), 0.0))
+                except queue.Empty:
+                    continue
+                
+                if isinstance(job, threading.Event):
+                    self._write_summary()
+                    next_summary = time.monotonic() + self.summary_interval
+                    job.set()
+                
+                else:
+                    self._write_trace(*job)
+            
+            except Exception as e:
+                Logger.ROOT.error(f"Failed to write traceback data: {format_exception(e)}")
+    
+    def flush(self, timeout: float = 5.0) -> None:
+        if not self._thread or not self._thread.is_alive():
+            return
+        
+        done = threading.Event()
+        self._jobs.put(done)
+        done.wait(timeout)
+
+
+traceback_aggregator = TracebackAggregator(
+    Path.LOG_TRACEBACKS,
+    conf.logging.traceback_window,
+    conf.logging.traceback_summary_interval
+)
+traceback_aggregator.start()
 
 
 def format_exception(e: Exception) -> str:
@@ -148,18 +529,6 @@ def log_exception(
     logger.log(level, formatted)
 
     if log_trace:
-        trace = traceback.format_exception(type(e), e, e.__traceback__)
-        trace = "".join(trace)
-
-        now = datetime.now().strftime("%d.%m.%y-%H%M%S")
-
-        filename = f"{type(e).__name__}-{now}.txt"
-        filepath = os.path.join(Path.LOG_TRACEBACKS, filename)
-        filedir = os.path.dirname(filepath)
-
-        os.makedirs(filedir, exist_ok=True)
-
-        with open(filepath, "w", encoding="utf-8") as f:
-            f.write(trace)
+        traceback_aggregator.record(e)
 
     return formatted
\ No newline at end of file
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from ...managers.locale.manager import compile_bundle
+from ...managers.locale.bundle import BundleError
+from ...paths import Path
+
+
+class Command(BaseCommand):
+    help = "Compiles every locale file into a single binary bundle loaded at boot"
+    
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--output", default=Path.LOCALE_BUNDLE.value, help="Where to write the bundle")
+        parser.add_argument("--force", action="store_true", help="Rebuild even if no source file changed")
+    
+    def handle(self, *args, **options) -> None:
+        try:
+            built = compile_bundle(options["output"], force=options["force"])
+        except BundleError as e:
+            raise CommandError(str(e))
+        
+        if built:
+            self.stdout.write(self.style.SUCCESS(f"Locale bundle written to '{options['output']}'"))
+        else:
+            self.stdout.write("Locale bundle is up to date")
\ No newline at end of file
@@ -11,14 +11,16 @@ from discord import Interaction, VoiceState, Guild, Member, Message, Embed
 from discord import Forbidden
 from typing import TYPE_CHECKING
 from gtts import gTTS
+from logging import INFO
 
 from ..helpers import value_to_colour
-from ..utils import get_full_command, get_channel, get_user_avatar
+from ..utils import get_full_command, get_channel, get_user_avatar, get_log_context
 from ..conf import conf
 from ..log import Logger, log_exception, format_exception
 from ..subclasses import Cog
 from ..objects import TTSClient
-from ..models import Guilds, GuildConfig, Warns, Users
+from ..cache import guild_config_cache
+from ..models import GuildConfig
 
 if TYPE_CHECKING:
     from ..client import Client
@@ -66,6 +68,7 @@ async def play_tts(client: TTSClient, message: str) -> None:
 class EventHandler(Cog, name="event_handler"):
     def __init__(self, client: "Client") -> None:
         self.client = client
+        self._lavalink_task: asyncio.Task | None = None
     
     @Cog.listener()
     async def on_ready(self) -> None:
@@ -82,18 +85,20 @@ class EventHandler(Cog, name="event_handler"):
             """
         )
         
-        self.client.start_time = time.time()
-        
-        # Connect to lavalink
-        await self._connect_to_lavalink()
+        if self.client.start_time is not None:
+            logger.info("Gateway session re-established, reconciling database in the background")
+            self.client.db_manager.start_reconciliation()
+            return
         
-        # Update DB
-        await self.client.db_manager.populate_database()
-        await self.client.db_manager.purge_database()
+        self.client.start_time = time.time()
         
         # Run tasks
         await self.client.task_handler.start()
         
+        # Connect to lavalink and update DB without holding up commands and tasks
+        self._lavalink_task = asyncio.create_task(self._connect_to_lavalink(), name="nova-lavalink-connect")
+        self.client.db_manager.start_reconciliation()
+        
         startup_time = time.time() - self.client.start_time
         logger.info(f"Nova took {startup_time:.2f}s to start")
     
@@ -140,25 +145,38 @@ class EventHandler(Cog, name="event_handler"):
     @Cog.listener()
     async def on_guild_join(self, guild: Guild) -> None:
         logger.info(f"Joined guild: {guild.name} (ID: {guild.id})")
-        await self.client.db_manager.populate_database()
+        await self.client.db_manager.sync_guild(guild)
     
     @Cog.listener()
     async def on_guild_remove(self, guild: Guild) -> None:
         logger.info(f"Left guild: {guild.name} (ID: {guild.id})")
-        await self.client.db_manager.purge_database()
+        await self.client.db_manager.purge_guild(guild.id)
     
     @Cog.listener()
     async def on_member_join(self, member: Member) -> None:
         logger.info(f"Member {member.name} joined: {member.guild.name} (ID: {member.guild.id})")
-        await self.client.db_manager.populate_database()
+        await self.client.db_manager.sync_member(member)
 
         await self._on_member_join_action_welcome(member)
         await self._on_member_join_action_role(member)
     
+    async def _get_guild_config(self, guild: Guild) -> GuildConfig | None:
+        guild_config = await guild_config_cache.get(guild.id)
+        
+        if not guild_config:
+            if self.client.db_manager.is_ready:
+                logger.warning(f"No database entry for {guild.name} (ID: {guild.id})")
+            else:
+                logger.debug(f"{guild.name} (ID: {guild.id}) hasn't been synced yet, skipping")
+        
+        return guild_config
+    
     async def _on_member_join_action_welcome(self, member: Member) -> None:
         guild = member.guild
-        guild_data = await Guilds.objects.aget(guild_id=guild.id)
-        guild_config: GuildConfig = guild_data.config
+        guild_config = await self._get_guild_config(guild)
+        
+        if not guild_config:
+            return
         
         if not guild_config.welcome_active or not guild_config.welcome_channel_id:
             return
@@ -207,8 +225,10 @@ class EventHandler(Cog, name="event_handler"):
     
     async def _on_member_join_action_role(self, member: Member) -> None:
         guild = member.guild
-        guild_data = await Guilds.objects.aget(guild_id=guild.id)
-        guild_config: GuildConfig = guild_data.config
+        guild_config = await self._get_guild_config(guild)
+        
+        if not guild_config:
+            return
         me = guild.me
         
         if not guild_config.auto_role_active or not guild_config.auto_role_id:
@@ -243,6 +263,7 @@ class EventHandler(Cog, name="event_handler"):
     @Cog.listener()
     async def on_member_remove(self, member: Member) -> None:
         logger.info(f"Member {member.display_name} left: {member.guild.name} (ID: {member.guild.id})")
+        await self.client.db_manager.remove_member(member)
     
     async def _on_spam_action(self, message: Message) -> None:
         guild = message.guild
@@ -269,8 +290,10 @@ class EventHandler(Cog, name="event_handler"):
                 
             await message.channel.send(msg)
         
-        guild_data: Guilds = await Guilds.objects.aget(guild_id=guild.id)
-        guild_config: GuildConfig = guild_data.config
+        guild_config = await self._get_guild_config(guild)
+        
+        if not guild_config:
+            return
         
         me = guild.me
         
@@ -295,23 +318,8 @@ class EventHandler(Cog, name="event_handler"):
             if spam_message:
                 await _send_message(spam_message)
             
-            try:
-                user_data = await Users.objects.aget(user_id=message.author.id)
-                
-                warn = await Warns.objects.acreate(
-                    user=user_data,
-                    reason="Spam",
-                    is_active=True
-                )
-                
-                await guild_data.warns.aadd(warn)
-            
-            except Exception as e:
-                logger.error(
-                    f"Failed to create warn for {message.author.display_name} on {guild.name} (ID: {guild.id})"
-                    f" - {format_exception(e)}"
-                )
-                log_exception(e, logger)
+            # Written in batches by the warn queue, the handler doesn't wait on the database
+            self.client.warn_queue.put(guild.id, message.author.id, "Spam")
     
     async def _on_message_tts(self, message: Message) -> None:
         guild = message.guild
@@ -401,6 +409,9 @@ class EventHandler(Cog, name="event_handler"):
     
     @Cog.listener()
     async def on_app_command_completion(self, interaction: Interaction, command: Command | ContextMenu) -> None:
+        if not logger.isEnabledFor(INFO):
+            return
+        
         guild = interaction.guild.name if interaction.guild else "DMs"
         guild_id = interaction.guild.id if interaction.guild else None
         user = interaction.user.name
@@ -410,5 +421,6 @@ class EventHandler(Cog, name="event_handler"):
         
         logger.info(
             f"Command '{command_name}' executed by {user} (ID: {user_id}) " \
-            f"on {guild} (ID: {guild_id})"
+            f"on {guild} (ID: {guild_id})",
+            extra=get_log_context(interaction, command.qualified_name)
         )
\ No newline at end of file
@@ -1,19 +1,11 @@
 from .manager import (
+    catalog,
+    resolver,
     get_locale,
     get_interaction_locale,
     get_localised_string,
-    get_localised_list
+    get_localised_list,
+    LOCALE_MAPPING
 )
 
-from .translator import Translator
-
-LOCALE_MAPPING = {
-    "en-US": "en",
-    "en-GB": "en",
-    "zh-CN": "zh",
-    "zh-TW": "zh",
-    "es-419": "es",
-    "pt-BR": "pt",
-    "es-ES": "es",
-    "sv-SE": "sv"
-}
\ No newline at end of file
+from .translator import Translator
\ No newline at end of file
@@ -0,0 +1,231 @@
+"""
+Compact binary locale bundle
+
+Layout (little endian):
+    * Header      - magic, version, counts, table offsets and a hash over every source file
+    * Strings     - (offset, length) index followed by one UTF-8 blob, every string stored once
+    * Locales     - name, section entry range and the hash of the source file it was built from
+    * Entries     - key, section, type and payload for every flattened key of every locale
+    * Items       - list elements referenced by list entries
+"""
+
+import os
+import mmap
+import struct
+import hashlib
+
+from dataclasses import fields
+from typing import Optional
+
+from ...objects import Localisation
+
+MAGIC = b"NOVALOC\x00"
+VERSION = 1
+
+HEADER = struct.Struct("<8sHHIIII32sIIII")
+STRING = struct.Struct("<II")
+LOCALE = struct.Struct("<III32s")
+ENTRY = struct.Struct("<IBBHq")
+ITEM = struct.Struct("<B7xq")
+
+TYPE_STR = 0
+TYPE_INT = 1
+TYPE_LIST = 2
+
+SECTIONS = [field.name for field in fields(Localisation)]
+
+
+class BundleError(Exception):
+    ...
+
+
+def hash_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).digest()
+
+
+def hash_sources(sources: dict[str, str]) -> bytes:
+    digest = hashlib.sha256()
+    
+    for locale in sorted(sources):
+        digest.update(locale.encode("utf-8"))
+        digest.update(hash_file(sources[locale]))
+    
+    return digest.digest()
+
+
+class _StringPool:
+    def __init__(self) -> None:
+        self.index: dict[str, int] = {}
+        self.strings: list[bytes] = []
+    
+    def add(self, value: str) -> int:
+        idx = self.index.get(value)
+        
+        if idx is None:
+            idx = len(self.strings)
+            self.index[value] = idx
+            self.strings.append(value.encode("utf-8"))
+        
+        return idx
+
+
+def build_bundle(locales: dict[str, tuple[Localisation, bytes]], sources_hash: bytes) -> bytes:
+    pool = _StringPool()
+    entries: list[bytes] = []
+    items: list[bytes] = []
+    locale_rows: list[tuple[int, int, int, bytes]] = []
+    
+    def encode_scalar(value: str | int) -> tuple[int, int]:
+        if isinstance(value, bool) or not isinstance(value, (str, int)):
+            raise BundleError(f"Unsupported locale value type '{type(value).__name__}'")
+        
+        if isinstance(value, str):
+            return TYPE_STR, pool.add(value)
+        
+        return TYPE_INT, value
+    
+    for locale in sorted(locales):
+        localisation, file_hash = locales[locale]
+        first_entry = len(entries)
+        
+        for section_idx, section in enumerate(SECTIONS):
+            for key, value in getattr(localisation, section).items():
+                key_idx = pool.add(key)
+                
+                if isinstance(value, list):
+                    first_item = len(items)
+                    
+                    for item in value:
+                        items.append(ITEM.pack(*encode_scalar(item)))
+                    
+                    entries.append(ENTRY.pack(key_idx, section_idx, TYPE_LIST, len(value), first_item))
+                
+                else:
+                    value_type, payload = encode_scalar(value)
+                    entries.append(ENTRY.pack(key_idx, section_idx, value_type, 0, payload))
+        
+        locale_rows.append((pool.add(locale), first_entry, len(entries) - first_entry, file_hash))
+    
+    string_index = bytearray()
+    blob = bytearray()
+    
+    for encoded in pool.strings:
+        string_index += STRING.pack(len(blob), len(encoded))
+        blob += encoded
+    
+    strings_offset = HEADER.size
+    locales_offset = strings_offset + len(string_index) + len(blob)
+    entries_offset = locales_offset + LOCALE.size * len(locale_rows)
+    items_offset = entries_offset + ENTRY.size * len(entries)
+    
+    header = HEADER.pack(
+        MAGIC, VERSION, len(locale_rows), len(pool.strings), len(entries), len(items), 0,
+        sources_hash, strings_offset, locales_offset, entries_offset, items_offset
+    )
+    
+    return b"".join([
+        header,
+        bytes(string_index),
+        bytes(blob),
+        b"".join(LOCALE.pack(*row) for row in locale_rows),
+        b"".join(entries),
+        b"".join(items)
+    ])
+
+
+class LocaleBundle:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        
+        try:
+            with open(path, "rb") as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        except (OSError, ValueError) as e:
+            raise BundleError(f"Couldn't map bundle at '{path}': {e}") from e
+        
+        try:
+            (
+                magic, version, locale_count, string_count, entry_count, item_count, _,
+                self.sources_hash, self._strings_offset, locales_offset, self._entries_offset, self._items_offset
+            ) = HEADER.unpack_from(self._map, 0)
+        
+        except struct.error as e:
+            self.close()
+            raise BundleError(f"Bundle at '{path}' is truncated") from e
+        
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise BundleError(f"Bundle at '{path}' has an unknown format (version {version})")
+        
+        self._blob_offset = self._strings_offset + STRING.size * string_count
+        self._decoded: dict[int, str] = {}
+        self.locales: dict[str, tuple[int, int, bytes]] = {}
+        
+        for i in range(locale_count):
+            name_idx, first_entry, count, file_hash = LOCALE.unpack_from(self._map, locales_offset + LOCALE.size * i)
+            self.locales[self._string(name_idx)] = (first_entry, count, file_hash)
+    
+    def _string(self, idx: int) -> str:
+        value = self._decoded.get(idx)
+        
+        if value is None:
+            offset, length = STRING.unpack_from(self._map, self._strings_offset + STRING.size * idx)
+            start = self._blob_offset + offset
+            value = self._map[start:start + length].decode("utf-8")
+            self._decoded[idx] = value
+        
+        return value
+    
+    def _scalar(self, value_type: int, payload: int) -> str | int:
+        return self._string(payload) if value_type == TYPE_STR else payload
+    
+    def file_hash(self, locale: str) -> Optional[bytes]:
+        row = self.locales.get(locale)
+        return row[2] if row else None
+    
+    def read(self, locale: str) -> Optional[Localisation]:
+        row = self.locales.get(locale)
+        
+        if row is None:
+            return None
+        
+        first_entry, count, _ = row
+        sections: dict[str, dict] = {section: {} for section in SECTIONS}
+        
+        for i in range(first_entry, first_entry + count):
+            key_idx, section_idx, value_type, length, payload = ENTRY.unpack_from(
+                self._map, self._entries_offset + ENTRY.size * i
+            )
+            
+            if value_type == TYPE_LIST:
+                value = [
+                    self._scalar(*ITEM.unpack_from(self._map, self._items_offset + ITEM.size * j))
+                    for j in range(payload, payload + length)
+                ]
+            else:
+                value = self._scalar(value_type, payload)
+            
+            sections[SECTIONS[section_idx]][self._string(key_idx)] = value
+        
+        return Localisation(**sections)
+    
+    def close(self) -> None:
+        if not self._map.closed:
+            self._map.close()
+
+
+def read_sources_hash(path: str) -> Optional[bytes]:
+    if not os.path.exists(path):
+        return None
+    
+    try:
+        bundle = LocaleBundle(path)
+    except BundleError:
+        return None
+    
+    try:
+        return bundle.sources_hash
+    finally:
+        bundle.close()
\ No newline at end of file
@@ -0,0 +1,213 @@
+import os
+import time
+import threading
+
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Callable, Mapping, Optional
+
+from ...objects import Localisation
+from ...log import Logger
+
+from .template import Template, LocalePlaceholderError, compare_templates
+
+logger = Logger.LOCALE
+
+LocaleValue = str | int | tuple[str | int, ...]
+
+
+@dataclass(frozen=True)
+class CatalogEntry:
+    locale: str
+    path: str
+    mtime: int
+    localisation: Localisation
+    strings: Mapping[str, LocaleValue]
+    templates: Mapping[str, Template]
+
+
+# Parsed locale files, each one is re-parsed only when its mtime changes and the mtime is
+# checked at most once every `check_interval` seconds
+class LocaleCatalog:
+    def __init__(
+            self,
+            directory: str,
+            loader: Callable[[str], Optional[Localisation]],
+            check_interval: float = 2.0
+    ) -> None:
+        self.directory = directory
+        self.check_interval = check_interval
+        
+        self._loader = loader
+        self._entries: dict[str, CatalogEntry] = {}
+        self._checked_at: dict[str, float] = {}
+        self._rejected: dict[str, int] = {}
+        self._lock = threading.Lock()
+        
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+        self.generation = 0
+    
+    def path_for(self, locale: str) -> str:
+        return os.path.join(self.directory, f"{locale}.yml")
+    
+    def _stat(self, path: str) -> Optional[int]:
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+    
+    def _flatten(self, localisation: Localisation) -> Mapping[str, LocaleValue]:
+        return MappingProxyType({
+            key: tuple(value) if isinstance(value, list) else value
+            for key, value in localisation.all().items()
+        })
+    
+    def _compile(self, locale: str, strings: Mapping[str, LocaleValue]) -> Mapping[str, Template]:
+        templates = {}
+        
+        for key, value in strings.items():
+            if not isinstance(value, str):
+                continue
+            
+            template = Template(value)
+            
+            if template.error:
+                logger.error(f"Key '{key}' in locale '{locale}' has a malformed placeholder: {template.error}")
+            
+            templates[key] = template
+        
+        return MappingProxyType(templates)
+    
+    def _check_placeholders(self, entry: CatalogEntry) -> Optional[str]:
+        report = []
+        
+        for other in self._entries.values():
+            if other.locale == entry.locale:
+                continue
+            
+            for key, expected, found in compare_templates(other.templates, entry.templates):
+                report.append(
+                    f"  * '{key}': {other.locale} has {sorted(expected) or 'none'}, "
+                    f"{entry.locale} has {sorted(found) or 'none'}"
+                )
+        
+        if not report:
+            return None
+        
+        return f"Placeholder mismatch between locales in '{entry.path}':\n" + "\n".join(report)
+    
+    def _load(self, locale: str, path: str, mtime: int, strict: bool = False) -> Optional[CatalogEntry]:
+        with self._lock:
+            entry = self._entries.get(locale)
+            
+            if entry and entry.mtime == mtime:
+                return entry
+            
+            localisation = self._loader(path)
+            
+            if localisation is None:
+                self._entries.pop(locale, None)
+                return None
+            
+            strings = self._flatten(localisation)
+            new_entry = CatalogEntry(
+                locale=locale,
+                path=path,
+                mtime=mtime,
+                localisation=localisation,
+                strings=strings,
+                templates=self._compile(locale, strings)
+            )
+            
+            report = self._check_placeholders(new_entry)
+            
+            if report:
+                if strict:
+                    raise LocalePlaceholderError(report)
+                
+                logger.error(report)
+                
+                if entry:
+                    logger.error(f"Keeping the previously loaded version of '{locale}'")
+                    self._rejected[locale] = mtime
+                    return entry
+            
+            if entry:
+                self.reloads += 1
+                logger.info(f"Locale '{locale}' changed on disk, reloaded")
+            else:
+                logger.debug(f"Locale '{locale}' loaded into catalog")
+            
+            self._entries[locale] = new_entry
+            self.generation += 1
+            
+            return new_entry
+    
+    def get(self, locale: str) -> Optional[CatalogEntry]:
+        entry = self._entries.get(locale)
+        now = time.monotonic()
+        
+        if entry and now - self._checked_at.get(locale, 0.0) < self.check_interval:
+            self.hits += 1
+            return entry
+        
+        self._checked_at[locale] = now
+        path = self.path_for(locale)
+        mtime = self._stat(path)
+        
+        if mtime is None:
+            if entry:
+                logger.warning(f"Locale file at '{path}' disappeared, dropping it from the catalog")
+                
+                with self._lock:
+                    self._entries.pop(locale, None)
+                    self.generation += 1
+            
+            self.misses += 1
+            return None
+        
+        if entry and (entry.mtime == mtime or self._rejected.get(locale) == mtime):
+            self.hits += 1
+            return entry
+        
+        self.misses += 1
+        
+        return self._load(locale, path, mtime)
+    
+    def load_all(self, strict: bool = True) -> list[CatalogEntry]:
+        entries = []
+        
+        for locale in self.available():
+            path = self.path_for(locale)
+            mtime = self._stat(path)
+            
+            if mtime is None:
+                continue
+            
+            self._checked_at[locale] = time.monotonic()
+            entry = self._load(locale, path, mtime, strict=strict)
+            
+            if entry:
+                entries.append(entry)
+        
+        return entries
+    
+    def loaded(self) -> list[str]:
+        return list(self._entries)
+    
+    def available(self) -> list[str]:
+        return sorted(
+            file[:-4] for file in os.listdir(self.directory)
+            if file.endswith(".yml")
+        )
+    
+    def stats(self) -> dict[str, int]:
+        return {
+            "locales": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "reloads": self.reloads,
+            "generation": self.generation
+        }
\ No newline at end of file
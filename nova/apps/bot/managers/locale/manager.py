@@ -9,6 +9,11 @@ from ..files.yaml import read
 from ...objects import Localisation
 from ...log import Logger
 from ...paths import Path
+from ...conf import conf
+
+from .catalog import LocaleCatalog, CatalogEntry
+from .resolver import LocaleResolver
+from .bundle import LocaleBundle, BundleError, build_bundle, hash_file, hash_sources, read_sources_hash
 
 logger = Logger.LOCALE
 locale_class = Localisation
@@ -17,6 +22,20 @@ SECTIONS = [field.name for field in fields(locale_class)]
 CHECKED: dict[str, bool] = {}
 INVALID_REPORTED_KEYS: dict[str, list[str]] = {}
 
+_bundle: Optional[LocaleBundle] = None
+_bundle_checked = False
+
+LOCALE_MAPPING = {
+    "en-US": "en",
+    "en-GB": "en",
+    "zh-CN": "zh",
+    "zh-TW": "zh",
+    "es-419": "es",
+    "pt-BR": "pt",
+    "es-ES": "es",
+    "sv-SE": "sv"
+}
+
 
 def check_sections(locale_file: str, locale_data: dict) -> bool:
     for section in SECTIONS:
@@ -36,13 +55,55 @@ def check_sections(locale_file: str, locale_data: dict) -> bool:
     return True
 
 
-def get_locale(locale: str | Locale) -> Optional[Localisation]:
-    base_locale_path = os.path.join(Path.LOCALE, f"{locale.value if isinstance(locale, Locale) else locale}.yml")
+def _get_bundle() -> Optional[LocaleBundle]:
+    global _bundle, _bundle_checked
     
-    if not os.path.exists(base_locale_path):
-        logger.error(f"Locale file at '{base_locale_path}' doesn't exist")
+    # Dev builds always read the YAML sources so edits show up without recompiling
+    if conf.debug:
         return None
     
+    if not _bundle_checked:
+        _bundle_checked = True
+        
+        if not os.path.exists(Path.LOCALE_BUNDLE):
+            logger.warning(f"No locale bundle at '{Path.LOCALE_BUNDLE.value}', falling back to YAML")
+            return None
+        
+        try:
+            _bundle = LocaleBundle(Path.LOCALE_BUNDLE)
+            logger.info(f"Loaded locale bundle with {len(_bundle.locales)} locale(s)")
+        
+        except BundleError as e:
+            logger.error(f"Locale bundle is invalid, falling back to YAML: {e}")
+    
+    return _bundle
+
+
+def _read_bundle(base_locale_path: str) -> Optional[Localisation]:
+    bundle = _get_bundle()
+    
+    if not bundle:
+        return None
+    
+    locale = os.path.basename(base_locale_path).removesuffix(".yml")
+    bundled_hash = bundle.file_hash(locale)
+    
+    if bundled_hash is None:
+        return None
+    
+    if bundled_hash != hash_file(base_locale_path):
+        logger.warning(f"Locale bundle is stale for '{locale}', falling back to YAML")
+        return None
+    
+    return bundle.read(locale)
+
+
+def _parse_locale(base_locale_path: str) -> Optional[Localisation]:
+    localisation = _read_bundle(base_locale_path)
+    
+    if localisation:
+        return localisation
+    
     locale_data = read(base_locale_path, silent=True)
     
     if locale_data is None or not isinstance(locale_data, dict) or not locale_data:
@@ -56,66 +117,104 @@ def get_locale(locale: str | Locale) -> Optional[Localisation]:
     return Localisation(**locale_data)
 
 
-def get_interaction_locale(interaction: Interaction) -> str:
-    locale = interaction.locale if interaction.locale else Locale.british_english
+catalog = LocaleCatalog(Path.LOCALE, _parse_locale)
+resolver = LocaleResolver(catalog, LOCALE_MAPPING, INVALID_REPORTED_KEYS)
+
+
+def compile_bundle(output: str = Path.LOCALE_BUNDLE, force: bool = False) -> bool:
+    sources = {locale: catalog.path_for(locale) for locale in catalog.available()}
+    sources_hash = hash_sources(sources)
+    
+    if not force and read_sources_hash(output) == sources_hash:
+        logger.info("Locale bundle is up to date, skipping")
+        return False
+    
+    locales: dict[str, tuple[Localisation, bytes]] = {}
+    
+    for locale, path in sources.items():
+        locale_data = read(path, silent=True)
+        
+        if not isinstance(locale_data, dict) or not check_sections(path, locale_data):
+            raise BundleError(f"Locale file at '{path}' is invalid, refusing to build bundle")
+        
+        locales[locale] = (Localisation(**locale_data), hash_file(path))
+    
+    data = build_bundle(locales, sources_hash)
+    
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    
+    # Write next to the target and swap it in so a running bot never maps a half-written file
+    tmp_path = f"{output}.tmp"
+    
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    
+    os.replace(tmp_path, output)
+    
+    logger.info(f"Wrote locale bundle with {len(locales)} locale(s) to '{output}' ({len(data)} bytes)")
     
-    if locale == Locale.american_english:
-        locale = Locale.british_english
+    return True
 
-    return locale.value
 
+def get_catalog_entry(locale: str | Locale) -> Optional[CatalogEntry]:
+    locale = locale.value if isinstance(locale, Locale) else locale
+    entry = catalog.get(locale)
+    
+    if not entry:
+        logger.error(f"Locale file at '{catalog.path_for(locale)}' doesn't exist or is invalid")
+        return None
+    
+    return entry
 
-def get_localised_string(locale: str | Locale, key: str, default: str = "", *args, **kwargs) -> str:    
-    text_data = get_locale(locale.value if isinstance(locale, Locale) else locale)
+
+def get_locale(locale: str | Locale) -> Optional[Localisation]:
+    entry = get_catalog_entry(locale)
     
-    if not text_data:
-        logger.error(f"Locale code '{locale}' not present in locale list, defaulting to 'en-GB'")
-        text_data = get_locale(Locale.british_english.value)
-        
-        if not text_data:
-            logger.error(f"Failed to load default locale, returning default")
-            return default
+    return entry.localisation if entry else None
+
+
+def get_interaction_locale(interaction: Interaction) -> str:
+    locale = interaction.locale if interaction.locale else Locale.british_english
     
-    all_text = text_data.all()
-    value = all_text.get(key, None)
+    return resolver.chain(locale)[0]
+
+
+def get_localised_string(locale: str | Locale, key: str, default: str = "", *args, **kwargs) -> str:    
+    resolved = resolver.resolve(locale, key)
     
-    if not value:
-        logger.error(f"Key '{key}' not present in locale data, returning default")
+    if not resolved:
         return default
     
-    if not isinstance(value, str):
+    value, template = resolved
+    
+    if template is None:
         logger.error(f"Key '{key}' is not a string in locale data, returning default")
         return default
     
-    if isinstance(value, str):
-        return value.format(*args, **kwargs)
+    try:
+        return template.render(*args, **kwargs)
     
-    return value
+    except (KeyError, IndexError) as e:
+        logger.error(
+            f"Failed to format key '{key}', missing placeholder {e} "
+            f"[Expected: {sorted(template.fields)} | Got: {sorted(kwargs)}], returning default"
+        )
+        return default
 
 
 def get_localised_list(locale: str | Locale, key: str, default: list[str | int] = []) -> list[str | int]:
     if isinstance(locale, tuple):
         locale = locale[0]
     
-    text_data = get_locale(locale.value if isinstance(locale, Locale) else locale)
+    resolved = resolver.resolve(locale, key)
     
-    if not text_data:
-        logger.error(f"Locale code '{locale}' not present in locale list, defaulting to 'en-GB'")
-        text_data = get_locale(Locale.british_english.value)
-        
-        if not text_data:
-            logger.error(f"Failed to load default locale, returning default")
-            return default
-    
-    all_text = text_data.all()
-    value = all_text.get(key, None)
-    
-    if not value:
-        logger.error(f"Key '{key}' not present in locale data, returning default")
+    if not resolved:
         return default
     
-    if not isinstance(value, list):
+    value, _ = resolved
+    
+    if not isinstance(value, tuple):
         logger.error(f"Key '{key}' is not a list in locale data, returning default")
         return default
     
-    return value
\ No newline at end of file
+    return list(value)
\ No newline at end of file
@@ -0,0 +1,123 @@
+import time
+
+from discord import Locale
+from typing import Optional
+
+from ...log import Logger
+
+from .catalog import LocaleCatalog, LocaleValue
+from .template import Template
+
+logger = Logger.LOCALE
+
+DEFAULT_LOCALE = Locale.british_english.value
+
+Resolution = tuple[LocaleValue, Optional[Template]]
+
+
+# Resolutions (misses included) are memoized until the catalog reloads a locale
+class LocaleResolver:
+    def __init__(
+            self,
+            catalog: LocaleCatalog,
+            mapping: dict[str, str],
+            negative_cache: dict[str, list[str]],
+            default: str = DEFAULT_LOCALE
+    ) -> None:
+        self.catalog = catalog
+        self.mapping = mapping
+        self.default = default
+        self.negative_cache = negative_cache
+        
+        self._chains: dict[str, tuple[str, ...]] = {}
+        self._memo: dict[tuple[str, str], Optional[Resolution]] = {}
+        self._generation: Optional[int] = None
+        self._checked_at = 0.0
+        
+        self.build_chains()
+    
+    def build_chains(self) -> None:
+        available = self.catalog.available()
+        codes = {locale.value for locale in Locale} | set(available)
+        chains = {}
+        
+        for code in codes:
+            chain = []
+            
+            for candidate in (code, self.mapping.get(code), self.default):
+                if candidate and candidate in available and candidate not in chain:
+                    chain.append(candidate)
+            
+            chains[code] = tuple(chain)
+        
+        self._chains = chains
+        self._memo.clear()
+    
+    def chain(self, locale: str | Locale) -> tuple[str, ...]:
+        locale = locale.value if isinstance(locale, Locale) else locale
+        chain = self._chains.get(locale)
+        
+        if chain is None:
+            chain = self._chains.get(self.default, (self.default,))
+        
+        return chain
+    
+    def _refresh(self) -> None:
+        now = time.monotonic()
+        
+        if now - self._checked_at >= self.catalog.check_interval:
+            self._checked_at = now
+            
+            for locale in self.catalog.loaded():
+                self.catalog.get(locale)
+        
+        if self._generation != self.catalog.generation:
+            self._generation = self.catalog.generation
+            self._memo.clear()
+    
+    def _report_missing(self, locale: str, key: str) -> None:
+        reported = self.negative_cache.setdefault(locale, [])
+        
+        if key not in reported:
+            reported.append(key)
+            logger.error(f"Key '{key}' not present in locale '{locale}' or its fallbacks {list(self.chain(locale))}")
+    
+    def resolve(self, locale: str | Locale, key: str) -> Optional[Resolution]:
+        locale = locale.value if isinstance(locale, Locale) else locale
+        
+        self._refresh()
+        
+        memo_key = (locale, key)
+        
+        try:
+            return self._memo[memo_key]
+        except KeyError:
+            pass
+        
+        resolution = None
+        
+        for source in self.chain(locale):
+            entry = self.catalog.get(source)
+            
+            if not entry:
+                continue
+            
+            value = entry.strings.get(key)
+            
+            if value is not None and value != "":
+                resolution = (value, entry.templates.get(key))
+                break
+        
+        if resolution is None:
+            self._report_missing(locale, key)
+        
+        self._memo[memo_key] = resolution
+        
+        return resolution
+    
+    def stats(self) -> dict[str, int]:
+        return {
+            "chains": len(self._chains),
+            "memoized": len(self._memo),
+            "missing": sum(len(keys) for keys in self.negative_cache.values())
+        }
\ No newline at end of file
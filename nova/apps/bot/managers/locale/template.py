@@ -0,0 +1,76 @@
+from string import Formatter
+from typing import Mapping, Optional
+
+_formatter = Formatter()
+
+
+class LocalePlaceholderError(ValueError):
+    ...
+
+
+def _field_root(field_name: str) -> str:
+    for i, char in enumerate(field_name):
+        if char in ".[":
+            return field_name[:i]
+    
+    return field_name
+
+
+# Strings without placeholders are rendered at load time, rendering them is an attribute read
+class Template:
+    __slots__ = ("source", "fields", "error", "_static")
+    
+    def __init__(self, source: str) -> None:
+        self.source = source
+        self.error: Optional[str] = None
+        self._static: Optional[str] = None
+        
+        fields: set[str] = set()
+        literals: list[str] = []
+        
+        try:
+            for literal, field_name, _, _ in _formatter.parse(source):
+                literals.append(literal)
+                
+                if field_name is not None:
+                    fields.add(_field_root(field_name))
+        
+        except ValueError as e:
+            self.error = str(e)
+            self._static = source
+        
+        self.fields = frozenset(fields)
+        
+        if not self.fields and self.error is None:
+            self._static = "".join(literals)
+    
+    @property
+    def is_static(self) -> bool:
+        return self._static is not None
+    
+    def render(self, *args, **kwargs) -> str:
+        if self._static is not None:
+            return self._static
+        
+        if args:
+            return self.source.format(*args, **kwargs)
+        
+        return self.source.format_map(kwargs)
+    
+    def __repr__(self) -> str:
+        return f"<Template fields={sorted(self.fields)} static={self.is_static}>"
+
+
+def compare_templates(
+        reference: Mapping[str, Template],
+        other: Mapping[str, Template]
+) -> list[tuple[str, frozenset[str], frozenset[str]]]:
+    mismatches = []
+    
+    for key, template in other.items():
+        ref = reference.get(key)
+        
+        if ref is not None and ref.fields != template.fields:
+            mismatches.append((key, ref.fields, template.fields))
+    
+    return mismatches
\ No newline at end of file
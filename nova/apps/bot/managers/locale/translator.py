@@ -1,4 +1,4 @@
-import os
+import time
 
 from discord import Locale
 from typing import Optional
@@ -9,14 +9,61 @@ from discord.app_commands import (
     TranslationContextTypes
 )
 
-from .manager import get_localised_string
+from .manager import catalog, resolver
 
-from ...paths import Path
+from ...log import Logger
 
-SUPPORTED_LOCALES = os.listdir(Path.LOCALE)
+logger = Logger.LOCALE
 
 
 class Translator(DCTranslator):
+    def __init__(self) -> None:
+        super().__init__()
+        
+        self._table: dict[tuple[str, str], str] = {}
+        self._generation: Optional[int] = None
+    
+    async def load(self) -> None:
+        catalog.load_all(strict=True)
+        resolver.build_chains()
+        self.build()
+    
+    async def unload(self) -> None:
+        self._table.clear()
+        self._generation = None
+    
+    def build(self) -> None:
+        start = time.perf_counter()
+        table: dict[tuple[str, str], str] = {}
+        
+        for locale in Locale:
+            # Walk the chain from least to most specific so closer locales win
+            for source in reversed(resolver.chain(locale)):
+                entry = catalog.get(source)
+                
+                if not entry:
+                    continue
+                
+                for key, value in entry.strings.items():
+                    # Empty values fall through to a less specific locale, like the resolver does
+                    if isinstance(value, str) and value != "":
+                        table[(key, locale.value)] = value
+        
+        self._table = table
+        self._generation = catalog.generation
+        
+        logger.info(
+            f"Built translation table: [Entries: {len(table)} | Locales: {len(catalog.loaded())} | "
+            f"Took: {(time.perf_counter() - start) * 1000:.2f}ms]"
+        )
+    
+    def refresh(self) -> None:
+        for locale in catalog.available():
+            catalog.get(locale)
+        
+        if self._generation != catalog.generation:
+            self.build()
+    
     async def translate(
             self,
             string: locale_str | str,
@@ -31,7 +78,4 @@ class Translator(DCTranslator):
         if not msg:
             return ""
         
-        if (locale == Locale.american_english) or (locale.value not in SUPPORTED_LOCALES):
-            locale = Locale.british_english
-        
-        return get_localised_string(locale.value, msg, default=msg)
\ No newline at end of file
+        return self._table.get((msg, locale.value), msg)
\ No newline at end of file
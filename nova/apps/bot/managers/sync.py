@@ -0,0 +1,148 @@
+import os
+import time
+import asyncio
+
+from discord import Guild
+from typing import TYPE_CHECKING, Optional
+
+from .files.json import read, write
+
+from ..log import Logger, log_exception
+from ..conf import conf
+from ..paths import Path
+
+if TYPE_CHECKING:
+    from ..client import Client
+    from ..checks.db import DBManager
+
+logger = Logger.DB
+
+CHECKPOINT_MAX_AGE = 3600  # Seconds, older checkpoints are ignored and the run starts over
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+    
+    async def acquire(self, tokens: int = 1) -> None:
+        async with self._lock:
+            self._refill()
+            
+            while self.tokens < tokens:
+                await asyncio.sleep((tokens - self.tokens) / self.rate)
+                self._refill()
+            
+            self.tokens -= tokens
+
+
+# Syncs up to `sync_concurrency` guilds at once, chunk requests are paced by a token bucket and
+# finished guilds are checkpointed so a restarted run picks up where it left off
+class SyncScheduler:
+    def __init__(self, client: "Client", db_manager: "DBManager") -> None:
+        self.client = client
+        self.db_manager = db_manager
+        self.concurrency = conf.database.sync_concurrency
+        self.bucket = TokenBucket(conf.database.sync_rate, conf.database.sync_burst)
+        
+        self._checkpoint_lock = asyncio.Lock()
+        self._completed: set[int] = set()
+        self._started_at = 0.0
+    
+    def _load_checkpoint(self) -> set[int]:
+        if not os.path.exists(Path.SYNC_CHECKPOINT):
+            return set()
+        
+        data = read(Path.SYNC_CHECKPOINT, silent=True, from_root=True)
+        
+        if not isinstance(data, dict):
+            return set()
+        
+        if time.time() - data.get("started_at", 0) > CHECKPOINT_MAX_AGE:
+            logger.info("Ignoring sync checkpoint, it's too old")
+            return set()
+        
+        self._started_at = data["started_at"]
+        
+        return set(data.get("completed", []))
+    
+    async def _save_checkpoint(self) -> None:
+        async with self._checkpoint_lock:
+            data = {"started_at": self._started_at, "completed": sorted(self._completed)}
+            await asyncio.to_thread(write, Path.SYNC_CHECKPOINT, data, True, True)
+    
+    async def _clear_checkpoint(self) -> None:
+        try:
+            await asyncio.to_thread(os.remove, Path.SYNC_CHECKPOINT)
+        except FileNotFoundError:
+            pass
+    
+    async def _sync_one(self, guild: Guild, semaphore: asyncio.Semaphore, progress: list[int], total: int) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            
+            try:
+                if not guild.chunked:
+                    await self.bucket.acquire()
+                    await guild.chunk()
+                
+                synced = await self.db_manager.sync_guild(guild)
+            
+            except Exception as e:
+                log_exception(e, logger)
+                synced = False
+            
+            if not synced:
+                logger.error(f"Failed to sync '{guild.name}' ({guild.id})")
+                return
+            
+            progress[0] += 1
+            self._completed.add(guild.id)
+            
+            logger.info(
+                f"[{progress[0]}/{total}] Synced '{guild.name}' ({guild.id}) " \
+                f"[Members: {guild.member_count} | Took: {time.perf_counter() - start:.2f}s]"
+            )
+        
+        await self._save_checkpoint()
+    
+    async def run(self, guilds: Optional[list[Guild]] = None) -> list[Guild]:
+        guilds = list(guilds if guilds is not None else self.client.guilds)
+        start = time.perf_counter()
+        
+        self._started_at = time.time()
+        self._completed = self._load_checkpoint()
+        
+        pending = [guild for guild in guilds if guild.id not in self._completed]
+        skipped = len(guilds) - len(pending)
+        
+        if skipped:
+            logger.info(f"Resuming sync from checkpoint, skipping {skipped} already synced guild(s)")
+        
+        # Largest first so the slowest guild starts right away instead of at the tail of the run
+        pending.sort(key=lambda guild: guild.member_count or 0, reverse=True)
+        
+        semaphore = asyncio.Semaphore(self.concurrency)
+        progress = [skipped]
+        
+        await asyncio.gather(*(
+            self._sync_one(guild, semaphore, progress, len(guilds)) for guild in pending
+        ))
+        
+        if progress[0] == len(guilds):
+            await self._clear_checkpoint()
+        
+        logger.info(
+            f"Synced {progress[0] - skipped}/{len(pending)} guild(s) in {time.perf_counter() - start:.2f}s " \
+            f"[Concurrency: {self.concurrency}]"
+        )
+        
+        return [guild for guild in pending if guild.id not in self._completed]
\ No newline at end of file
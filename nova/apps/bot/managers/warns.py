@@ -0,0 +1,367 @@
+import time
+import asyncio
+
+from asgiref.sync import sync_to_async
+from collections import Counter
+from dataclasses import dataclass
+from discord import Forbidden, HTTPException
+from django.db import connection, transaction
+from typing import TYPE_CHECKING, Optional
+
+from .locale import get_localised_string
+
+from ..log import Logger, log_exception, format_exception
+from ..conf import conf
+from ..cache import guild_config_cache
+from ..instrumentation import instrumentation
+from ..utils import get_member
+from ..models import Guilds, Users, Warns, WarnCounter
+
+if TYPE_CHECKING:
+    from ..client import Client
+
+logger = Logger.DB
+
+MAX_ATTEMPTS = 3
+
+# (guild_id, user_id, count before, count after)
+CounterChange = tuple[int, int, int, int]
+
+
+def _qn(name: str) -> str:
+    return connection.ops.quote_name(name)
+
+
+def increment_counters(deltas: Counter) -> list[CounterChange]:
+    # Must run inside the transaction that activated the warns
+    if not deltas:
+        return []
+    
+    keys = list(deltas)
+    
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {_qn(WarnCounter._meta.db_table)} AS c (guild_id, user_id, active_count)
+            SELECT * FROM unnest(%s::bigint[], %s::bigint[], %s::int[])
+            ON CONFLICT (guild_id, user_id) DO UPDATE SET active_count = c.active_count + EXCLUDED.active_count
+            RETURNING c.guild_id, c.user_id, c.active_count
+            """,
+            [[key[0] for key in keys], [key[1] for key in keys], [deltas[key] for key in keys]]
+        )
+        
+        return [
+            (guild_id, user_id, count - deltas[(guild_id, user_id)], count)
+            for guild_id, user_id, count in cursor.fetchall()
+        ]
+
+
+def decrement_counters(deltas: Counter) -> None:
+    if not deltas:
+        return
+    
+    keys = list(deltas)
+    
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            UPDATE {_qn(WarnCounter._meta.db_table)} AS c
+            SET active_count = GREATEST(c.active_count - d.delta, 0)
+            FROM unnest(%s::bigint[], %s::bigint[], %s::int[]) AS d(guild_id, user_id, delta)
+            WHERE c.guild_id = d.guild_id AND c.user_id = d.user_id
+            """,
+            [[key[0] for key in keys], [key[1] for key in keys], [deltas[key] for key in keys]]
+        )
+
+
+@sync_to_async
+def resync_counters() -> list[CounterChange]:
+    warns = _qn(Warns._meta.db_table)
+    through = _qn(Guilds.warns.through._meta.db_table)
+    counters = _qn(WarnCounter._meta.db_table)
+    
+    # Recounts every pair in one statement, catches whatever deletes, admin edits and raw SQL
+    # left behind, the drifted pairs are returned so the limit engine can catch up on them
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                WITH actual AS (
+                    SELECT gw.guilds_id AS guild_id, w.user_id, COUNT(*)::int AS active_count
+                    FROM {through} gw JOIN {warns} w ON w.id = gw.warns_id
+                    WHERE w.is_active
+                    GROUP BY gw.guilds_id, w.user_id
+                ),
+                drifted AS (
+                    SELECT
+                        COALESCE(a.guild_id, c.guild_id) AS guild_id,
+                        COALESCE(a.user_id, c.user_id) AS user_id,
+                        COALESCE(c.active_count, 0) AS before,
+                        COALESCE(a.active_count, 0) AS after
+                    FROM actual a FULL JOIN {counters} c ON c.guild_id = a.guild_id AND c.user_id = a.user_id
+                    WHERE COALESCE(c.active_count, 0) <> COALESCE(a.active_count, 0)
+                ),
+                corrected AS (
+                    INSERT INTO {counters} AS c (guild_id, user_id, active_count)
+                    SELECT guild_id, user_id, after FROM drifted
+                    ON CONFLICT (guild_id, user_id) DO UPDATE SET active_count = EXCLUDED.active_count
+                )
+                SELECT guild_id, user_id, before, after FROM drifted
+                """
+            )
+            
+            return cursor.fetchall()
+
+
+# Queue writes are checked as soon as they land and signal writes in this process once they
+# commit, counters raised from another process (e.g. the web app) are never enforced
+class WarnLimitEngine:
+    current: Optional["WarnLimitEngine"] = None
+    
+    def __init__(self, client: "Client") -> None:
+        self.client = client
+        
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    def attach(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        WarnLimitEngine.current = self
+    
+    @classmethod
+    def dispatch(cls, changes: list[CounterChange]) -> None:
+        # Called from sync ORM code running in a worker thread
+        engine = cls.current
+        
+        if not changes or engine is None or engine._loop is None or engine._loop.is_closed():
+            return
+        
+        transaction.on_commit(lambda: asyncio.run_coroutine_threadsafe(engine.check(changes), engine._loop))
+    
+    async def check(self, changes: list[CounterChange]) -> None:
+        for guild_id, user_id, before, after in changes:
+            guild_config = await guild_config_cache.get(guild_id)
+            
+            if not guild_config or not guild_config.warn_action:
+                continue
+            
+            limit = guild_config.warn_limit
+            
+            # A kicked or banned member keeps their active warns, so once they're back every new
+            # warn has to act again instead of waiting for a crossing that already happened
+            if guild_config.warn_action == 1:
+                reached = before < limit <= after
+            else:
+                reached = before < after and after >= limit
+            
+            if reached:
+                try:
+                    await self._apply(guild_id, user_id, after, guild_config.warn_limit, guild_config.warn_action)
+                except Exception as e:
+                    logger.error(f"Failed to apply warn limit action in guild ({guild_id}): {format_exception(e)}")
+                    log_exception(e, logger)
+    
+    async def _apply(self, guild_id: int, user_id: int, count: int, limit: int, action: int) -> None:
+        guild = self.client.get_guild(guild_id)
+        
+        if not guild:
+            return
+        
+        member = await get_member(self.client, guild, user_id)
+        
+        if not member:
+            logger.info(f"User ({user_id}) reached the warn limit on {guild.name} (ID: {guild.id}) but left")
+            return
+        
+        locale = guild.preferred_locale
+        me = guild.me
+        
+        logger.info(
+            f"{member.name} ({member.id}) reached the warn limit on {guild.name} (ID: {guild.id}): "
+            f"[Warns: {count} | Limit: {limit} | Action: {action}]"
+        )
+        
+        if action == 1:
+            await self._notify(member, get_localised_string(
+                locale, "warn_limit_notify", count=count, limit=limit, guild=guild.name
+            ))
+        
+        elif action == 2:
+            if not me.guild_permissions.kick_members or member.top_role >= me.top_role:
+                logger.warning(f"I can't kick {member.name} ({member.id}) on {guild.name} (ID: {guild.id})")
+                return
+            
+            await self._notify(member, get_localised_string(locale, "warn_limit_kicked", guild=guild.name))
+            await member.kick(reason=get_localised_string(locale, "warn_limit_reason", count=count))
+        
+        elif action == 3:
+            if not me.guild_permissions.ban_members or member.top_role >= me.top_role:
+                logger.warning(f"I can't ban {member.name} ({member.id}) on {guild.name} (ID: {guild.id})")
+                return
+            
+            await self._notify(member, get_localised_string(locale, "warn_limit_banned", guild=guild.name))
+            await guild.ban(member, reason=get_localised_string(locale, "warn_limit_reason", count=count))
+    
+    @staticmethod
+    async def _notify(member, message: str) -> None:
+        try:
+            await member.send(message)
+        except (Forbidden, HTTPException):
+            logger.debug(f"Couldn't DM {member.name} ({member.id}) about the warn limit")
+
+
+@dataclass
+class PendingWarn:
+    guild_id: int
+    user_id: int
+    reason: str
+    moderator_id: Optional[int] = None
+    attempts: int = 0
+
+
+# Buffers warns and writes them in one transaction every `warn_flush_ms` or once `warn_batch_size`
+# are pending. `stop()` flushes the rest, so it must run before the event loop goes away
+class WarnQueue:
+    def __init__(self, engine: Optional[WarnLimitEngine] = None) -> None:
+        self.engine = engine
+        self.interval = conf.database.warn_flush_ms / 1000
+        self.batch_size = conf.database.warn_batch_size
+        self.written = 0
+        
+        self._pending: list[PendingWarn] = []
+        self._wake = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+        self._stopped = False
+    
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="nova-warn-queue")
+    
+    def put(self, guild_id: int, user_id: int, reason: str, moderator_id: Optional[int] = None) -> None:
+        if self._stopped:
+            logger.warning(f"Warn queue is stopped, dropping warn for user ({user_id}) in guild ({guild_id})")
+            return
+        
+        self._pending.append(PendingWarn(guild_id, user_id, reason, moderator_id))
+        
+        if len(self._pending) >= self.batch_size:
+            self._wake.set()
+    
+    def __len__(self) -> int:
+        return len(self._pending)
+    
+    async def _run(self) -> None:
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            
+            self._wake.clear()
+            
+            if not self._pending:
+                continue
+            
+            try:
+                async with instrumentation.track("warn_queue_flush", "job"):
+                    await self.flush()
+            except Exception as e:
+                logger.error("Warn queue flush failed")
+                log_exception(e, logger)
+    
+    async def flush(self) -> int:
+        changes: list[CounterChange] = []
+        
+        async with self._flush_lock:
+            written = 0
+            
+            while self._pending:
+                batch, self._pending = self._pending[:self.batch_size], self._pending[self.batch_size:]
+                start = time.perf_counter()
+                
+                try:
+                    count, batch_changes = await self._write(batch)
+                    written += count
+                    changes.extend(batch_changes)
+                
+                except Exception as e:
+                    retry = [warn for warn in batch if warn.attempts + 1 < MAX_ATTEMPTS]
+                    
+                    for warn in retry:
+                        warn.attempts += 1
+                    
+                    self._pending[:0] = retry
+                    
+                    logger.error(f"Failed to write {len(batch)} warn(s), {len(batch) - len(retry)} dropped")
+                    log_exception(e, logger)
+                    
+                    break
+                
+                logger.debug(f"Wrote {len(batch)} warn(s) in {(time.perf_counter() - start) * 1000:.2f}ms")
+            
+            self.written += written
+        
+        # Actions hit the Discord API, so they run after the lock is released and are skipped once
+        # the client has closed (the final flush on shutdown)
+        if changes and self.engine and not self.engine.client.is_closed():
+            await self.engine.check(changes)
+        
+        return written
+    
+    @sync_to_async
+    def _write(self, batch: list[PendingWarn]) -> tuple[int, list[CounterChange]]:
+        guild_ids = {warn.guild_id for warn in batch}
+        user_ids = {warn.user_id for warn in batch} | {warn.moderator_id for warn in batch if warn.moderator_id}
+        
+        known_guilds = set(Guilds.objects.filter(guild_id__in=guild_ids).values_list("guild_id", flat=True))
+        known_users = set(Users.objects.filter(user_id__in=user_ids).values_list("user_id", flat=True))
+        
+        valid = []
+        
+        for warn in batch:
+            if warn.guild_id not in known_guilds or warn.user_id not in known_users:
+                logger.warning(f"Skipping warn for unknown user ({warn.user_id}) or guild ({warn.guild_id})")
+                continue
+            
+            valid.append(warn)
+        
+        if not valid:
+            return 0, []
+        
+        through = Guilds.warns.through
+        
+        with transaction.atomic():
+            warns = Warns.objects.bulk_create([
+                Warns(
+                    user_id=warn.user_id,
+                    moderator_id=warn.moderator_id if warn.moderator_id in known_users else None,
+                    reason=warn.reason,
+                    is_active=True
+                ) for warn in valid
+            ])
+            
+            through.objects.bulk_create([
+                through(guilds_id=pending.guild_id, warns_id=warn.id)
+                for pending, warn in zip(valid, warns)
+            ])
+            
+            changes = increment_counters(Counter((warn.guild_id, warn.user_id) for warn in valid))
+        
+        return len(warns), changes
+    
+    async def stop(self) -> None:
+        # Let an in-flight flush finish instead of cancelling it halfway through a batch
+        self._closing = True
+        self._wake.set()
+        
+        if self._task:
+            await self._task
+            self._task = None
+        
+        pending = len(self._pending)
+        written = await self.flush()
+        self._stopped = True
+        
+        if pending:
+            logger.info(f"Flushed {written}/{pending} pending warn(s) on shutdown")
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bot', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='guilds',
+            name='member_fingerprint',
+            field=models.CharField(blank=True, default='', max_length=32),
+        ),
+    ]
@@ -0,0 +1,47 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_counters(apps, schema_editor):
+    Guilds = apps.get_model('bot', 'Guilds')
+    Warns = apps.get_model('bot', 'Warns')
+    WarnCounter = apps.get_model('bot', 'WarnCounter')
+    
+    qn = schema_editor.quote_name
+    
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {qn(WarnCounter._meta.db_table)} (guild_id, user_id, active_count)
+            SELECT gw.guilds_id, w.user_id, COUNT(*)
+            FROM {qn(Guilds.warns.through._meta.db_table)} gw
+            JOIN {qn(Warns._meta.db_table)} w ON w.id = gw.warns_id
+            WHERE w.is_active
+            GROUP BY gw.guilds_id, w.user_id
+            """
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bot', '0002_guilds_member_fingerprint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WarnCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('active_count', models.PositiveIntegerField(default=0)),
+                ('guild', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='warn_counters', to='bot.guilds')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='warn_counters', to='bot.users')),
+            ],
+            options={
+                'verbose_name': 'Warn counter',
+                'verbose_name_plural': 'Warn counters',
+                'constraints': [models.UniqueConstraint(fields=('guild', 'user'), name='bot_warncounter_guild_user_uniq')],
+            },
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
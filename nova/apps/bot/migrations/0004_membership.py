@@ -0,0 +1,81 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def copy_to_memberships(apps, schema_editor):
+    Guilds = apps.get_model('bot', 'Guilds')
+    Membership = apps.get_model('bot', 'Membership')
+    
+    qn = schema_editor.quote_name
+    
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {qn(Membership._meta.db_table)} (guild_id, user_id, is_member, is_admin, is_blacklisted)
+            SELECT guilds_id, users_id, bool_or(kind = 'member'), bool_or(kind = 'admin'), bool_or(kind = 'blacklist')
+            FROM (
+                SELECT guilds_id, users_id, 'member' AS kind FROM {qn(Guilds.users.through._meta.db_table)}
+                UNION ALL
+                SELECT guilds_id, users_id, 'admin' FROM {qn(Guilds.admins.through._meta.db_table)}
+                UNION ALL
+                SELECT guilds_id, users_id, 'blacklist' FROM {qn(Guilds.blacklist.through._meta.db_table)}
+            ) AS links
+            GROUP BY guilds_id, users_id
+            """
+        )
+
+
+def copy_from_memberships(apps, schema_editor):
+    Guilds = apps.get_model('bot', 'Guilds')
+    Membership = apps.get_model('bot', 'Membership')
+    
+    qn = schema_editor.quote_name
+    
+    with schema_editor.connection.cursor() as cursor:
+        for field, flag in (('users', 'is_member'), ('admins', 'is_admin'), ('blacklist', 'is_blacklisted')):
+            cursor.execute(
+                f"""
+                INSERT INTO {qn(getattr(Guilds, field).through._meta.db_table)} (guilds_id, users_id)
+                SELECT guild_id, user_id FROM {qn(Membership._meta.db_table)} WHERE {flag}
+                """
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bot', '0003_warncounter'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Membership',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('is_member', models.BooleanField(default=True)),
+                ('is_admin', models.BooleanField(default=False)),
+                ('is_blacklisted', models.BooleanField(default=False)),
+                ('guild', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='memberships', to='bot.guilds')),
+                ('user', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='memberships', to='bot.users')),
+            ],
+            options={
+                'verbose_name': 'Membership',
+                'verbose_name_plural': 'Memberships',
+                'indexes': [models.Index(fields=['user'], name='bot_membership_user_idx')],
+                'constraints': [models.UniqueConstraint(fields=('guild', 'user'), name='bot_membership_guild_user_uniq')],
+            },
+        ),
+        migrations.RunPython(copy_to_memberships, copy_from_memberships),
+        migrations.RemoveField(
+            model_name='guilds',
+            name='admins',
+        ),
+        migrations.RemoveField(
+            model_name='guilds',
+            name='blacklist',
+        ),
+        migrations.RemoveField(
+            model_name='guilds',
+            name='users',
+        ),
+    ]
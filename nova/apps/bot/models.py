@@ -161,6 +161,15 @@ class Warns(models.Model):
     date = models.DateTimeField(auto_now_add=True, db_index=True)
     is_active = models.BooleanField(default=True)  # type: ignore
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        
+        # Lets the post_save receiver spot is_active flips without querying the old row
+        instance._loaded_is_active = instance.__dict__.get("is_active")
+        
+        return instance
+    
     class Meta:
         verbose_name = "Warn"
         verbose_name_plural = "Warns"
@@ -173,14 +182,44 @@ class Guilds(models.Model):
     guild_id = models.BigIntegerField(primary_key=True, db_index=True)
     guild_name = models.CharField(max_length=255, db_index=True)
     guild_icon_url = models.URLField(null=True, blank=True)
+    member_fingerprint = models.CharField(max_length=32, blank=True, default="")
     
     config = models.OneToOneField(GuildConfig, on_delete=models.CASCADE, related_name="guild")
     
-    users = models.ManyToManyField(Users, blank=True, related_name="guilds")
-    admins = models.ManyToManyField(Users, blank=True, related_name="guilds_admins")
-    blacklist = models.ManyToManyField(Users, blank=True, related_name="guilds_blacklist")
     warns = models.ManyToManyField(Warns, blank=True, related_name="guilds")
 
     class Meta:
         verbose_name = "Guild"
-        verbose_name_plural = "Guilds"
\ No newline at end of file
+        verbose_name_plural = "Guilds"
+
+
+class Membership(models.Model):
+    guild = models.ForeignKey(Guilds, on_delete=models.CASCADE, related_name="memberships", db_index=False)
+    user = models.ForeignKey(Users, on_delete=models.CASCADE, related_name="memberships", db_index=False)
+    
+    is_member = models.BooleanField(default=True)  # type: ignore
+    is_admin = models.BooleanField(default=False)  # type: ignore
+    is_blacklisted = models.BooleanField(default=False)  # type: ignore
+    
+    class Meta:
+        verbose_name = "Membership"
+        verbose_name_plural = "Memberships"
+        constraints = [
+            models.UniqueConstraint(fields=["guild", "user"], name="bot_membership_guild_user_uniq"),
+        ]
+        indexes = [
+            models.Index(fields=["user"], name="bot_membership_user_idx"),
+        ]
+
+
+class WarnCounter(models.Model):
+    guild = models.ForeignKey(Guilds, on_delete=models.CASCADE, related_name="warn_counters")
+    user = models.ForeignKey(Users, on_delete=models.CASCADE, related_name="warn_counters")
+    active_count = models.PositiveIntegerField(default=0)  # type: ignore
+    
+    class Meta:
+        verbose_name = "Warn counter"
+        verbose_name_plural = "Warn counters"
+        constraints = [
+            models.UniqueConstraint(fields=["guild", "user"], name="bot_warncounter_guild_user_uniq"),
+        ]
\ No newline at end of file
@@ -13,4 +13,7 @@ class Path(StrEnum):
     LOG_HISTORY = get_os_path("/var/lib/nova/logs/history", from_root=True)
     LOG_TRACEBACKS = get_os_path("/var/lib/nova/logs/tracebacks", from_root=True)
     CACHE = get_os_path("/var/lib/nova/cache", from_root=True)
-    TREE_HASH = get_os_path("/var/lib/nova/cache/tree_hash.txt", from_root=True)
\ No newline at end of file
+    TREE_HASH = get_os_path("/var/lib/nova/cache/tree_hash.txt", from_root=True)
+    SYNC_CHECKPOINT = get_os_path("/var/lib/nova/cache/sync_checkpoint.json", from_root=True)
+    LOCALE_BUNDLE = get_os_path("/var/lib/nova/cache/locale.bin", from_root=True)
+    OWNERS_VERSION = get_os_path("/var/lib/nova/cache/owners_version", from_root=True)
\ No newline at end of file
@@ -0,0 +1,222 @@
+import time
+import asyncio
+
+from django.conf import settings
+from typing import Optional, Any
+
+from .conf import conf
+from .log import Logger, format_exception
+from .instrumentation import instrumentation
+from .models import Guilds, GuildConfig, Membership, Owners
+
+try:
+    import asyncpg
+except ImportError:
+    asyncpg = None
+
+logger = Logger.DB
+
+
+def _table(model) -> str:
+    return '"' + model._meta.db_table.replace('"', '""') + '"'
+
+
+def _build_queries() -> dict[str, str]:
+    guilds = _table(Guilds)
+    config = _table(GuildConfig)
+    owners = _table(Owners)
+    membership = _table(Membership)
+    config_columns = ", ".join(f'c."{field.column}"' for field in GuildConfig._meta.concrete_fields)
+    config_fk = Guilds._meta.get_field("config").column
+    config_pk = GuildConfig._meta.pk.column
+    
+    return {
+        "guild_config": f'SELECT {config_columns} FROM {config} c JOIN {guilds} g ON g."{config_fk}" = c."{config_pk}" '
+                        f"WHERE g.guild_id = $1",
+        "is_blacklisted": f"SELECT EXISTS(SELECT 1 FROM {guilds} WHERE guild_id = $1), "
+                          f"EXISTS(SELECT 1 FROM {membership} WHERE guild_id = $1 AND user_id = $2 AND is_blacklisted)",
+        "blacklist": f"SELECT guild_id, user_id FROM {membership} WHERE is_blacklisted",
+        "owners": f"SELECT user_id FROM {owners}"
+    }
+
+
+class PoolUnavailable(Exception):
+    pass
+
+
+# Serves the queries that run on nearly every command or event, writes stay with the ORM. Every
+# accessor falls back to the ORM when asyncpg is missing, unhealthy or loses its connection
+class DBPool:
+    def __init__(self) -> None:
+        self.healthy = False
+        
+        self._pool: Optional["asyncpg.Pool"] = None
+        self._queries: dict[str, str] = {}
+        self._health_task: Optional[asyncio.Task] = None
+    
+    @property
+    def available(self) -> bool:
+        return self._pool is not None and self.healthy
+    
+    async def start(self) -> None:
+        if asyncpg is None:
+            logger.warning("asyncpg is not installed, hot queries will go through the ORM")
+            return
+        
+        if self._pool is not None:
+            return
+        
+        db = settings.DATABASES["default"]
+        self._queries = _build_queries()
+        
+        try:
+            self._pool = await asyncpg.create_pool(
+                database=db["NAME"],
+                user=db["USER"],
+                password=db["PASSWORD"],
+                host=db["HOST"],
+                port=int(db["PORT"]),
+                min_size=conf.database.pool_min_size,
+                max_size=conf.database.pool_max_size,
+                command_timeout=conf.database.pool_command_timeout,
+                statement_cache_size=conf.database.pool_statement_cache_size,
+                max_inactive_connection_lifetime=conf.database.pool_max_idle
+            )
+        
+        except Exception as e:
+            logger.error(f"Failed to create connection pool, hot queries will go through the ORM: {format_exception(e)}")
+            self._pool = None
+            return
+        
+        self.healthy = True
+        self._health_task = asyncio.create_task(self._health_loop(), name="nova-db-pool-health")
+        
+        logger.info(
+            f"Connection pool ready: [Min: {conf.database.pool_min_size} | Max: {conf.database.pool_max_size}]"
+        )
+    
+    async def close(self) -> None:
+        if self._health_task:
+            self._health_task.cancel()
+            
+            try:
+                await self._health_task
+            except asyncio.CancelledError:
+                pass
+            
+            self._health_task = None
+        
+        if self._pool is not None:
+            pool, self._pool = self._pool, None
+            self.healthy = False
+            
+            try:
+                await asyncio.wait_for(pool.close(), timeout=10)
+            except Exception as e:
+                logger.warning(f"Connection pool didn't close cleanly, terminating: {format_exception(e)}")
+                pool.terminate()
+            
+            logger.info("Connection pool closed")
+    
+    async def check(self) -> bool:
+        if self._pool is None:
+            return False
+        
+        try:
+            async with self._pool.acquire(timeout=conf.database.pool_command_timeout) as conn:
+                await conn.fetchval("SELECT 1")
+        
+        except Exception as e:
+            if self.healthy:
+                logger.error(f"Connection pool health check failed, falling back to the ORM: {format_exception(e)}")
+            
+            # Drop whatever is left so the next acquire opens fresh connections
+            self._pool.expire_connections()
+            self.healthy = False
+            
+            return False
+        
+        if not self.healthy:
+            logger.info("Connection pool is healthy again")
+        
+        self.healthy = True
+        return True
+    
+    async def _health_loop(self) -> None:
+        while True:
+            await asyncio.sleep(conf.database.pool_health_check_interval)
+            await self.check()
+    
+    async def _run(self, method: str, query: str, *args) -> Any:
+        if not self.available:
+            raise PoolUnavailable
+        
+        start = time.perf_counter()
+        
+        try:
+            async with self._pool.acquire(timeout=conf.database.pool_command_timeout) as conn:  # type: ignore
+                return await getattr(conn, method)(self._queries[query], *args)
+        
+        except (OSError, asyncpg.InterfaceError, asyncpg.PostgresConnectionError) as e:
+            # Route callers to the ORM until the next health check succeeds
+            logger.error(f"Lost connection while running '{query}': {format_exception(e)}")
+            self.healthy = False
+            raise PoolUnavailable from e
+        
+        except asyncio.TimeoutError as e:
+            logger.warning(f"Timed out running '{query}', using the ORM instead")
+            raise PoolUnavailable from e
+        
+        finally:
+            instrumentation.record_query(time.perf_counter() - start)
+    
+    async def _fetch(self, query: str, *args) -> list[Any]:
+        return await self._run("fetch", query, *args)
+    
+    async def _fetchrow(self, query: str, *args) -> Optional[Any]:
+        return await self._run("fetchrow", query, *args)
+    
+    async def guild_config(self, guild_id: int) -> Optional[GuildConfig]:
+        try:
+            row = await self._fetchrow("guild_config", guild_id)
+        except PoolUnavailable:
+            return await GuildConfig.objects.filter(guild__guild_id=guild_id).afirst()
+        
+        if row is None:
+            return None
+        
+        fields = [field.attname for field in GuildConfig._meta.concrete_fields]
+        return GuildConfig.from_db("default", fields, tuple(row.values()))
+    
+    async def is_blacklisted(self, guild_id: int, user_id: int) -> Optional[bool]:
+        # None if the guild has no database entry
+        try:
+            guild_exists, blacklisted = await self._fetchrow("is_blacklisted", guild_id, user_id)  # type: ignore
+            return blacklisted if guild_exists else None
+        
+        except PoolUnavailable:
+            pass
+        
+        blacklisted = await Membership.objects.filter(
+            guild_id=guild_id, user_id=user_id
+        ).values_list("is_blacklisted", flat=True).afirst()
+        
+        if blacklisted is None and await Guilds.objects.filter(guild_id=guild_id).aexists():
+            blacklisted = False
+        
+        return blacklisted
+    
+    async def blacklist(self) -> list[tuple[int, int]]:
+        try:
+            return [(row[0], row[1]) for row in await self._fetch("blacklist")]
+        except PoolUnavailable:
+            return [row async for row in Membership.objects.filter(is_blacklisted=True).values_list("guild_id", "user_id")]
+    
+    async def owners(self) -> set[int]:
+        try:
+            return {row[0] for row in await self._fetch("owners")}
+        except PoolUnavailable:
+            return {user_id async for user_id in Owners.objects.values_list("user_id", flat=True)}
+
+
+db_pool = DBPool()
@@ -14,10 +14,12 @@ from discord.ui import View
 from discord.utils import MISSING
 from discord.client import Client
 from typing import Optional
+from logging import INFO
 
 from .objects import Response
 from .log import Logger, log_exception
 from .helpers import filter_dict
+from .utils import get_log_context
 
 logger = Logger.RESPONDER
 
@@ -121,7 +123,7 @@ async def respond(
         response_type=response_type
     )
     
-    if silent:
+    if silent or not logger.isEnabledFor(INFO):
         return
     
     if embed and view:
@@ -140,7 +142,8 @@ async def respond(
             logger.info(
                 f"Response sent: [TYPE: {response_type_str} | "
                 f"AUTHOR: {author} (ID: {author.id if author else 0}) | "
-                f"DMs | MSG: {message_content}]"
+                f"DMs | MSG: {message_content}]",
+                extra=get_log_context(ctx)
             )
 
         elif guild:
@@ -149,5 +152,6 @@ async def respond(
                 f"GUILD: {guild} (ID: {guild.id}) | "
                 f"AUTHOR: {author} (ID: {author.id if author else 0}) | "
                 f"CH: {channel.name} (ID: {channel.id}) | "
-                f"MSG: {message_content}]"
+                f"MSG: {message_content}]",
+                extra=get_log_context(ctx)
             )
\ No newline at end of file
@@ -0,0 +1,110 @@
+from collections import Counter
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+
+from .cache import guild_config_cache, blacklist_index, owner_cache
+from .managers.warns import WarnLimitEngine, increment_counters, decrement_counters
+from .models import Guilds, GuildConfig, Owners, Users, Warns, Membership
+
+
+@receiver([post_save, post_delete], sender=GuildConfig, dispatch_uid="nova_guild_config_changed")
+def guild_config_changed(sender, instance: GuildConfig, **kwargs) -> None:
+    guild_config_cache.invalidate_config(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Guilds, dispatch_uid="nova_guild_changed")
+def guild_changed(sender, instance: Guilds, **kwargs) -> None:
+    guild_config_cache.invalidate(instance.guild_id)
+
+
+@receiver(post_save, sender=Owners, dispatch_uid="nova_owner_saved")
+def owner_saved(sender, instance: Owners, **kwargs) -> None:
+    owner_cache.add(instance.user_id)
+    owner_cache.bump()
+
+
+@receiver(post_delete, sender=Owners, dispatch_uid="nova_owner_deleted")
+def owner_deleted(sender, instance: Owners, **kwargs) -> None:
+    owner_cache.discard(instance.user_id)
+    owner_cache.bump()
+
+
+@receiver(post_save, sender=Membership, dispatch_uid="nova_membership_saved")
+def membership_saved(sender, instance: Membership, **kwargs) -> None:
+    if instance.is_blacklisted:
+        blacklist_index.add(instance.guild_id, {instance.user_id})
+    else:
+        blacklist_index.remove(instance.guild_id, {instance.user_id})
+
+
+# Memberships only go away with their guild or user, cleaning up there keeps Membership fast
+# deletable instead of loading every row of a cascade just to send signals
+@receiver(post_delete, sender=Guilds, dispatch_uid="nova_guild_deleted")
+def guild_deleted(sender, instance: Guilds, **kwargs) -> None:
+    blacklist_index.remove_guild(instance.guild_id)
+
+
+@receiver(post_delete, sender=Users, dispatch_uid="nova_user_deleted")
+def user_deleted(sender, instance: Users, **kwargs) -> None:
+    blacklist_index.remove_users({instance.user_id})
+
+
+# Warn counters, the warn queue maintains them itself (bulk writes don't send signals), these
+# cover is_active flips and guild links made elsewhere. There are deliberately no delete
+# receivers, they would turn every cascading purge into a per-row loop, counters left behind by
+# deletes are corrected in one pass by `resync_counters` during reconciliation
+
+def _warn_guild_pairs(warn: Warns) -> Counter:
+    guild_ids = Guilds.warns.through.objects.filter(warns_id=warn.pk).values_list("guilds_id", flat=True)
+    return Counter((guild_id, warn.user_id) for guild_id in guild_ids)
+
+
+@receiver(post_save, sender=Warns, dispatch_uid="nova_warn_saved")
+def warn_saved(sender, instance: Warns, created: bool, **kwargs) -> None:
+    was_active = getattr(instance, "_loaded_is_active", None)
+    instance._loaded_is_active = instance.is_active
+    
+    if created or was_active is None or was_active == instance.is_active:
+        return
+    
+    if instance.is_active:
+        WarnLimitEngine.dispatch(increment_counters(_warn_guild_pairs(instance)))
+    else:
+        decrement_counters(_warn_guild_pairs(instance))
+
+
+@receiver(m2m_changed, sender=Guilds.warns.through, dispatch_uid="nova_guild_warns_changed")
+def guild_warns_changed(
+        sender,
+        instance: Guilds | Warns,
+        action: str,
+        reverse: bool,
+        pk_set: set[int] | None,
+        **kwargs
+) -> None:
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    
+    if action == "pre_clear":
+        if reverse:
+            pk_set = set(instance.guilds.values_list("guild_id", flat=True))  # type: ignore
+        else:
+            pk_set = set(instance.warns.values_list("id", flat=True))  # type: ignore
+    
+    if not pk_set:
+        return
+    
+    # Forward changes come from a guild with warn pks, reverse ones from a warn with guild pks
+    if reverse:
+        if not instance.is_active:  # type: ignore
+            return
+        
+        deltas = Counter((guild_id, instance.user_id) for guild_id in pk_set)  # type: ignore
+    else:
+        user_ids = Warns.objects.filter(pk__in=pk_set, is_active=True).values_list("user_id", flat=True)
+        deltas = Counter((instance.pk, user_id) for user_id in user_ids)
+    
+    if action == "post_add":
+        WarnLimitEngine.dispatch(increment_counters(deltas))
+    else:
+        decrement_counters(deltas)
@@ -2,18 +2,19 @@ import os
 import json
 import hashlib
 
-from discord import Interaction, Colour
-from discord.app_commands import MissingPermissions, BotMissingPermissions, Command, Group
+from discord import Interaction, Colour, AppCommandOptionType
+from discord.app_commands import MissingPermissions, BotMissingPermissions, Command, Group, CommandTree
 from discord.app_commands.errors import AppCommandError, TransformerError
 from typing import Optional, TYPE_CHECKING
 
-from .managers.locale import get_interaction_locale, get_localised_string
+from .managers.locale import get_interaction_locale, get_localised_string, Translator
 from .log import Logger, log_exception
 from .responder import respond
 from .errors import NovaError
 from .paths import Path
 from .conf import conf
 from .utils import get_guild
+from .instrumentation import instrumentation
 
 if TYPE_CHECKING:
     from .client import Client
@@ -54,6 +55,28 @@ async def on_error(interaction: Interaction, error: AppCommandError) -> None:
         await respond(interaction, Colour.red(), string, hidden=True)
 
 
+def _command_path(interaction: Interaction) -> str:
+    data = interaction.data or {}
+    parts = [data.get("name", "unknown")]
+    options = data.get("options", [])
+    
+    # Walk down subcommand groups and subcommands, they come in as single nested options
+    while options and options[0].get("type") in (
+        AppCommandOptionType.subcommand_group.value,
+        AppCommandOptionType.subcommand.value
+    ):
+        parts.append(options[0]["name"])
+        options = options[0].get("options", [])
+    
+    return "/" + " ".join(parts)
+
+
+class NovaCommandTree(CommandTree):
+    async def _call(self, interaction: Interaction) -> None:
+        async with instrumentation.track(_command_path(interaction), "command"):
+            await super()._call(interaction)
+
+
 class TreeSyncer:
     def __init__(self, client: "Client") -> None:
         self.client = client
@@ -175,6 +198,11 @@ class TreeSyncer:
     async def _sync(self) -> None:
         logger.info("Syncing commands")
         
+        translator = self.client.tree.translator
+        
+        if isinstance(translator, Translator):
+            translator.refresh()
+        
         await self.client.tree.sync()
         
         if conf.testing_servers:
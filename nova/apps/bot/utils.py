@@ -18,6 +18,7 @@ from discord import (
 )
 
 from discord.abc import PrivateChannel
+from discord.utils import utcnow
 from discord.threads import Thread
 from discord.app_commands import Command
 from typing import Optional, Union, TYPE_CHECKING
@@ -54,6 +55,15 @@ def get_full_command(interaction: Interaction) -> str:
     return command_name
 
 
+def get_log_context(interaction: Interaction, command: Optional[str] = None) -> dict:
+    return {
+        "guild_id": interaction.guild_id,
+        "user_id": interaction.user.id if interaction.user else None,
+        "command": command or (interaction.command.qualified_name if interaction.command else None),
+        "latency_ms": round((utcnow() - interaction.created_at).total_seconds() * 1000, 2)
+    }
+
+
 async def get_guild(client: "Client", guild_id: int) -> Optional[Guild]:
     try:
         guild = client.get_guild(guild_id)
@@ -0,0 +1,86 @@
+"""
+Console log formatter benchmark
+
+Measures how many records per second the console handler shared by every `Logger.*`
+instance can format, comparing the per-record formatter construction Nova used to do
+against the cached per-level formatters in `apps.bot.formatters`.
+
+Usage (from the `nova` directory):
+    python scripts/bench_logging.py [--records 200000]
+"""
+
+import io
+import os
+import sys
+import time
+import logging
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from apps.bot.formatters import LoggingFormatter, DATE_FORMAT
+
+LEVELS = [logging.DEBUG, logging.INFO, logging.WARNING, logging.ERROR, logging.CRITICAL]
+
+
+class LegacyLoggingFormatter(LoggingFormatter):
+    def format(self, record):
+        log_color = self.COLOURS.get(record.levelno)
+        
+        format_str = self.FORMAT
+        format_str = format_str.replace("(black)", self.black + self.bold)
+        format_str = format_str.replace("(reset)", self.reset)
+        format_str = format_str.replace("(levelcolor)", log_color if log_color is not None else "")
+        format_str = format_str.replace("(green)", self.green + self.bold)
+        
+        formatter = logging.Formatter(format_str, DATE_FORMAT, style="{")
+        
+        return formatter.format(record)
+
+
+def make_records(count: int) -> list[logging.LogRecord]:
+    return [
+        logging.makeLogRecord({
+            "name": "Responder",
+            "levelno": LEVELS[i % len(LEVELS)],
+            "levelname": logging.getLevelName(LEVELS[i % len(LEVELS)]),
+            "msg": f"Response sent: [TYPE: Embed | GUILD: Nova (ID: {i}) | MSG: benchmark]"
+        })
+        for i in range(count)
+    ]
+
+
+def run(formatter: logging.Formatter, records: list[logging.LogRecord]) -> float:
+    handler = logging.StreamHandler(io.StringIO())
+    handler.setFormatter(formatter)
+    
+    start = time.perf_counter()
+    
+    for record in records:
+        handler.handle(record)
+    
+    return len(records) / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=200000)
+    args = parser.parse_args()
+    
+    records = make_records(args.records)
+    
+    # Warm up both paths before measuring
+    run(LegacyLoggingFormatter(), records[:1000])
+    run(LoggingFormatter(), records[:1000])
+    
+    before = run(LegacyLoggingFormatter(), records)
+    after = run(LoggingFormatter(), records)
+    
+    print(f"Records:        {args.records}")
+    print(f"Before (rec/s): {before:,.0f}")
+    print(f"After  (rec/s): {after:,.0f}")
+    print(f"Speedup:        {after / before:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
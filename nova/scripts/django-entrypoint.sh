@@ -17,6 +17,7 @@ trap handle_term SIGTERM SIGINT
 
 python manage.py makemigrations
 python manage.py migrate
+python manage.py compile_locales
 
 if [ "$BOT_RUN_WITH_DJANGO" = "True" ]; then
     echo "Starting Django with bot integration..."